@@ -1,17 +1,23 @@
-import io
 import logging
-import re
+import os
 
 import discord
-from aiohttp import ClientSession
-from discord import Embed, File
+from discord import Embed
 from discord.ext import commands
 
+from utils.nitrado import NitradoError
+from utils.paginator import Paginator
+from utils.playerlist import PlayerList, PlayerListSetting, read_names
+
+# Source of truth for `banlist sync` when no names are given, one per line
+SOURCE_FILE = 'lists/bans.txt'
+
 
 class Banlist(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        self.players = PlayerListSetting(bot.nitrado, bot.service_id, 'bans')
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -46,104 +52,109 @@ class Banlist(commands.Cog):
 
     @banlist.command(name='show', description='Shows the Banlist of the Server.')
     async def show(self, ctx: commands.Context) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
-                    return await ctx.send(
-                        f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {res.status})```')
-                else:
-                    json = await res.json()
-                    bl = json['data']['gameserver']['settings']['general']['bans']
-                    embed = Embed(title=f'__**Banlist**__', color=0X000001,
-                                timestamp=ctx.message.created_at, description=f'')
-                    embed.set_footer(icon_url=ctx.author.avatar_url, text=ctx.author.name)
-                    if bl == '':
-                        embed.description += '`Empty`'
-                        return await ctx.send(embed=embed)
-                    else:
-                        blList = bl.split()
-                        embed.description += f'Banlist User Count: {len(blList)}'
-                        for userName in blList:
-                            embed.description += f'\n`• {userName}`'
-                        if len(embed.description) > 2000:
-                            embed.description = re.sub(r'`+', '', embed.description)
-                            banlistFile = io.BytesIO(embed.description.encode('utf-8'))
-                            return await ctx.send(
-                                f'```\nThe Banlist of the Server is too long to send it trough a '
-                                f'Embed.```',
-                                file=File(banlistFile, 'banlist.txt'))
-                        else:
-                            return await ctx.send(embed=embed)
-
-    @banlist.command(name='add', description='Adds a User to the Banlist of a Server.', usage='<User>')
-    async def add(self, ctx: commands.Context, ign: str) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
+        try:
+            players = await self.players.load()
+        except NitradoError as e:
+            return await ctx.send(
+                f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+        if not players:
+            embed = Embed(title=f'__**Banlist**__', color=0X000001,
+                        timestamp=ctx.message.created_at, description='`Empty`')
+            embed.set_footer(icon_url=ctx.author.avatar_url, text=ctx.author.name)
+            return await ctx.send(embed=embed)
+        else:
+            paginator = Paginator('__**Banlist**__', list(players), header=f'Banlist User Count: {len(players)}',
+                                  template='`• {}`')
+            return await paginator.start(ctx)
+
+    @banlist.command(name='add', description='Adds one or more Users (one per line) to the Banlist of a Server.', usage='<User> [User...]')
+    async def add(self, ctx: commands.Context, *, ign: str) -> discord.Message:
+        names = ign.splitlines()
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            added = players.update(names)
+            if not added:
+                return await ctx.send(f'{", ".join(names)} is already on the Banlist of the Server.')
+            else:
+                try:
+                    await self.players.save(players)
+                except NitradoError as e:
                     return await ctx.send(
-                        f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {res.status})```')
-                else:
-                    json = await res.json()
-                    bl = json['data']['gameserver']['settings']['general']['bans']
-                    if re.search(f'{ign}', bl):
-                        return await ctx.send(f'{ign} is already on the Banlist of the Server.')
-                    else:
-                        if bl == '':
-                            value = f'{ign}'
-                        else:
-                            value = f'{bl}\r{ign}'
-                        params = {'category': 'general', 'key': 'bans', 'value': value}
-                        async with sess.post(
-                                f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers/settings',
-                                headers=headers, params=params) as response:
-                            if response.status != 200:
-                                return await ctx.send(
-                                    f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {res.status})```')
-                            else:
-                                return await ctx.send(f'Added {ign} to the Banlist of the Server.')
-
-    @banlist.command(name='remove', description='Removes a User from the Banlist of the Server.', usage='<User>')
-    async def remove(self, ctx: commands.Context, ign: str) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
+                        f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {e.status})```')
+                return await ctx.send(f'Added {", ".join(added)} to the Banlist of the Server.')
+
+    @banlist.command(name='remove', description='Removes one or more Users (one per line) from the Banlist of the Server.', usage='<User> [User...]')
+    async def remove(self, ctx: commands.Context, *, ign: str) -> discord.Message:
+        names = ign.splitlines()
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            removed = players.difference_update(names)
+            if not removed:
+                return await ctx.send(f'{", ".join(names)} is not on the Banlist of the Server.')
+            else:
+                try:
+                    await self.players.save(players)
+                except NitradoError as e:
                     return await ctx.send(
-                        f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {res.status})```')
-                else:
-                    json = await res.json()
-                    bl = json['data']['gameserver']['settings']['general']['bans']
-                    if not re.search(f'{ign}', bl):
-                        return await ctx.send(f'{ign} is not on the Banlist of the Server.')
-                    else:
-                        bl = bl.strip()
-                        bl = re.sub(rf'{ign}', '', bl)
-                        bl = re.sub('\n+', '\r', bl)
-                        bl = re.sub('\n', '\r', bl)
-                        bl = re.sub('\r+', '\r', bl)
-                        bl = re.sub('\r\n+', '\r', bl)
-                        bl = re.sub('\n\n+', '\r', bl)
-                        bl = re.sub('\r\r+', '\r', bl)
-                        bl = re.sub('\n', '\r', bl)
-                        bl = bl.strip()
-
-                        value = f'{bl}'
-
-                        params = {'category': 'general', 'key': 'bans', 'value': value}
-                        async with sess.post(
-                                f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers/settings',
-                                headers=headers, params=params) as resp:
-                            if resp.status != 200:
-                                return await ctx.send(
-                                    f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {resp.status})```')
-                            else:
-                                return await ctx.send(
-                                    f'Removed {ign} from the Banlist of the Server.')
+                        f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {e.status})```')
+                return await ctx.send(
+                    f'Removed {", ".join(removed)} from the Banlist of the Server.')
+
+    @banlist.command(name='import', description='Adds the Users of an attached file or of the following lines to the Banlist of the Server.', usage='[User per line]')
+    async def import_users(self, ctx: commands.Context, *, ign: str = None) -> discord.Message:
+        names = await read_names(ctx.message, ign)
+        if not names:
+            return await ctx.send('```\nNo Users given. Attach a file or list them one per line.```')
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            added = players.update(names)
+            if not added:
+                return await ctx.send(f'All {len(names)} Users are already on the Banlist of the Server.')
+            try:
+                await self.players.save(players)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {e.status})```')
+        return await ctx.send(f'Added {len(added)} of {len(names)} Users to the Banlist of the Server.')
+
+    @banlist.command(name='sync', description='Makes the Banlist of the Server match an attached file, the following lines or the local banlist file.', usage='[User per line]')
+    async def sync(self, ctx: commands.Context, *, ign: str = None) -> discord.Message:
+        names = await read_names(ctx.message, ign)
+        if not names and os.path.exists(SOURCE_FILE):
+            with open(SOURCE_FILE, encoding='utf-8-sig') as f:
+                names = [line.strip() for line in f if line.strip()]
+        if not names:
+            # Never taken as a request to empty the list
+            return await ctx.send(f'```\nNo Users given. Attach a file, list them one per line or fill {SOURCE_FILE}.```')
+        target = PlayerList(names)
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            removed = players.difference_update([userName for userName in players if userName not in target])
+            added = players.update(target)
+            if not added and not removed:
+                return await ctx.send(f'The Banlist of the Server is already in sync.')
+            try:
+                await self.players.save(players)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error while trying to Update the Banlist. (Status Code: {e.status})```')
+        return await ctx.send(f'Synced the Banlist of the Server: {len(added)} added, {len(removed)} removed.')
 
 
 def setup(bot) -> None:
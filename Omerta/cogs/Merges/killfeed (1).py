@@ -1,88 +1,145 @@
 import asyncio
 import logging
-import re
-from math import sqrt
+from collections import deque
 import datetime
+import time as clock
+from os import path
 
 import discord
 from aiofiles import open
-from aiohttp import ClientSession
 from discord.ext import commands
 from discord.ext import tasks as task
 
+from utils import adm
+from utils.changes import ChangeTracker, file_fingerprint
+from utils.checkpoint import CheckpointStore
+from utils.nitrado import NitradoError, stream_to_file
+from utils.outbox import Outbox
+from utils.pipeline import Pipeline, Stage
+from utils.roster import roster_of
+from utils.schedule import AdaptiveSchedule, STOPPED
+from utils.seen import SeenLines
+from utils.settings import ServiceSettings, settings_of
+from utils.stats import StatBatch
+from utils.zones import ZoneIndex
 
-class Killfeed(commands.Cog):
-    def __init__(self, bot) -> None:
-        self.bot = bot
-        self.logger = logging.getLogger(__name__)
-        self.read_lines = {f"{self.bot.service_id}": []}
-        self.last_logfile = ""
+# Lines that may wait to be handled before reading the log waits too
+PIPELINE_QUEUE_SIZE = 1000
 
-    async def get_zones(self) -> list:
-        async with self.bot.dbz.acquire() as conn:
-            query = f'SELECT * FROM "{self.bot.service_id}";'
-            zones = await conn.fetch(query)
+# Tasks per step of the killfeed, lines (and the end of a poll) only stay in order with one each
+PARSE_WORKERS = 1
+HANDLE_WORKERS = 1
+PUBLISH_WORKERS = 1
 
-        return zones
+# Embeds waiting to be posted per channel before the killfeed waits for Discord
+OUTBOX_QUEUE_SIZE = 100
 
-    async def increment(self, key: str, playerID: str, value: int) -> bool:
-        async with self.bot.dbs.acquire() as conn:
-            queryIncrement = f"""UPDATE "{self.bot.service_id}" SET {key} = {key} + {value} WHERE player_id = '{playerID}'"""
-            increment = await conn.execute(queryIncrement)
+# Seconds between polls while there is some activity, busy servers are polled down to
+# POLL_INTERVAL_MIN and idle or stopped ones back off up to POLL_INTERVAL_MAX
+POLL_INTERVAL = 120
+POLL_INTERVAL_MIN = 60
+POLL_INTERVAL_MAX = 600
+POLL_BUSY_LINES = 500
+POLL_JITTER = 0.1
 
-        if not increment:
-            return False
+# Ask Nitrado for the log's size before downloading it and skip it when unchanged
+PROBE_LOG_SIZE = True
 
-        return True
+# Where the read position is kept between restarts, next to the cogs instead of wherever the bot was started from
+CHECKPOINT_DIR = path.abspath(path.join(path.dirname(__file__), "..", "cache"))
 
-    async def reset(self, key: str, playerID: str) -> bool:
-        async with self.bot.dbs.acquire() as conn:
-            queryReset = (
-                f'UPDATE "{self.bot.service_id}" SET {key} = $1 WHERE player_id = $2;'
-            )
-            reset = await conn.execute(queryReset, 0, playerID)
-            if not reset:
-                return False
+# Seconds the zones are kept before they're read from the database again, nothing
+# in this bot writes them, so that's how long a zone edited elsewhere takes to apply
+ZONE_CACHE_TTL = 60
 
-            return True
+# Lines whose position is used for zone alarms and the player's last location
+POSITION_KINDS = frozenset(
+    (adm.POSITION, adm.PLACED, adm.BUILT, adm.DISMANTLED, adm.SUICIDE,
+     adm.BLED_OUT, adm.WOLF, adm.BEAR, adm.ZOMBIE, adm.DEAD)
+)
 
-    async def set_status(
-        self, playerID: str, playerName: str, onlineStatus: bool
-    ) -> bool:
-        async with self.bot.dbs.acquire() as conn:
-            querySetStatus = f'UPDATE "{self.bot.service_id}" SET (online, player_name) = ($1, $2) WHERE player_id = $3;'
-            setStatus = await conn.execute(
-                querySetStatus, onlineStatus, playerName, playerID
-            )
-            if not setStatus:
-                return False
 
-            return True
+class Poll:
+    """What the lines of one read of the log share: the service settings, stat changes and zone positions."""
 
-    async def insert_player(self, playerName: str, playerID: str) -> bool:
-        async with self.bot.dbs.acquire() as conn:
-            queryInsertPlayer = f'INSERT INTO "{self.bot.service_id}" (player_id, player_name, online) VALUES ($1, $2, $3) ON CONFLICT (player_id) DO UPDATE SET (player_name, online) = ($2, $3);'
-            insertPlayer = await conn.execute(
-                queryInsertPlayer, playerID, playerName, True
-            )
-            if not insertPlayer:
-                return False
+    __slots__ = ("service", "dayz_map", "zones", "batch", "positions")
 
-            return True
+    def __init__(self, service: ServiceSettings, dayz_map: str, zones: ZoneIndex) -> None:
+        self.service = service
+        self.dayz_map = dayz_map
+        self.zones = zones
+        self.batch = StatBatch()
+        self.positions = []
 
-    async def calculate_online_time(self, playerID: str, logoTime: str) -> None:
-        async with self.bot.dbs.acquire() as conn:
-            query = (
-                f'SELECT last_login FROM "{self.bot.service_id}" WHERE player_id = $1;'
-            )
-            lastLoginDB = await conn.fetchval(query, playerID)
 
-        timeLastLogin = datetime.datetime.strptime(
-            str(lastLoginDB), "%Y-%m-%d %H:%M:%S"
+class PollEnd:
+    """Put after a poll, reaches the persist stage once all of the poll's lines went through the others."""
+
+    __slots__ = ("poll",)
+
+    def __init__(self, poll: Poll) -> None:
+        self.poll = poll
+
+
+class Killfeed(commands.Cog):
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        self.read_lines = {self.bot.service_id: SeenLines()}
+        self.recent_events = deque(maxlen=2)
+        self.checkpoints = CheckpointStore(CHECKPOINT_DIR)
+        self.tail = self.checkpoints.load(self.bot.service_id)
+        self.changes = ChangeTracker(probe=PROBE_LOG_SIZE)
+        self.outbox = Outbox(bot, OUTBOX_QUEUE_SIZE)
+        self.last_logins = {}
+        self.unflushed = None
+        self.roster = roster_of(bot)
+        self.settings = settings_of(bot).use()
+        self.zones = ZoneIndex()
+        self.zones_expire = 0.0
+        self.schedule = AdaptiveSchedule(
+            POLL_INTERVAL, POLL_INTERVAL_MIN, POLL_INTERVAL_MAX,
+            busy_lines=POLL_BUSY_LINES, jitter=POLL_JITTER,
+        )
+        # parse -> handle -> publish -> persist, publishing waits while the outbox is full, which holds back the rest
+        self.pipeline = Pipeline(
+            Stage("parse", self.read_log, workers=PARSE_WORKERS, maxsize=2),
+            Stage("handle", self.handle_line, workers=HANDLE_WORKERS, maxsize=PIPELINE_QUEUE_SIZE),
+            Stage("publish", self.publish, workers=PUBLISH_WORKERS, maxsize=PIPELINE_QUEUE_SIZE),
+            Stage("persist", self.persist, maxsize=2),
         )
-        timeLogout = datetime.datetime.strptime(logoTime, "%Y-%m-%d %H:%M:%S")
-        playtime = (timeLogout - timeLastLogin).total_seconds()
-        await self.increment("playtime", playerID, int(playtime))
+
+    async def get_zones(self) -> ZoneIndex:
+        if clock.monotonic() >= self.zones_expire:
+            async with self.bot.dbz.acquire() as conn:
+                query = f'SELECT * FROM "{self.bot.service_id}";'
+                zones = await conn.fetch(query)
+
+            self.zones = ZoneIndex(zones)
+            self.zones_expire = clock.monotonic() + ZONE_CACHE_TTL
+
+        return self.zones
+
+    async def load_last_logins(self) -> None:
+        # Online players that connected before the bot was started, read with one query per poll
+        # instead of one per disconnect line
+        await self.roster.load(self.bot.dbs, self.bot.service_id)
+        missing = [player.player_id for player in self.roster if player.player_id not in self.last_logins]
+        if not missing:
+            return
+
+        async with self.bot.dbs.acquire() as conn:
+            query = f'SELECT player_id, last_login FROM "{self.bot.service_id}" WHERE player_id = ANY($1::text[]);'
+            rows = await conn.fetch(query, missing)
+        for row in rows:
+            self.last_logins.setdefault(row["player_id"], row["last_login"])
+        for playerID in missing:
+            # Without a row they have no login to count from, no need to ask again
+            self.last_logins.setdefault(playerID, None)
+
+    def last_login(self, playerID: str):
+        # Read from the log, or loaded for the players already online by load_last_logins
+        return self.last_logins.pop(playerID, None)
 
     @commands.command(hidden=True, name="logout")
     @commands.guild_only()
@@ -90,38 +147,41 @@ class Killfeed(commands.Cog):
     async def logout(self, ctx: commands.Context):
         if not ctx.author.id == ctx.guild.owner_id:
             return
-        async with open("cache/logFileCache.txt", mode="w") as f:
-            for line in self.read_lines[self.bot.service_id]:
-                if "AdminLog" in line:
-                    continue
-                await f.write(line)
-
-        async with open("cache/logBeginningCache.txt", mode="w") as f:
-            text = self.last_logfile
-            text = re.sub(r"\n\s*\n", "\n", text, re.MULTILINE)
-            await f.write(text)
+        if self.unflushed is None:
+            self.checkpoints.save(self.bot.service_id, self.tail)
+        else:
+            # Left where it was, the lines are read again after the restart and their stats written then
+            self.logger.warning(f"Stats for {self.bot.service_id} weren't saved, not moving the Log Checkpoint")
 
         return (
-            await ctx.send("Successfully saved Cache to log.txt. Logging out now."),
+            await ctx.send("Successfully saved the Log Checkpoint. Logging out now."),
             await self.bot.change_presence(status=discord.Status.invisible),
             await self.bot.close(),
         )
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        async with open("cache/logFileCache.txt", mode="r") as f:
-            cachedLogFile = await f.read()
-            self.read_lines[self.bot.service_id] = cachedLogFile.splitlines()
-
-        async with open("cache/logBeginningCache.txt", mode="r") as f:
-            cachedLogFileBeginning = await f.read()
-            self.last_logfile = cachedLogFileBeginning
-
         self.logger.info(f"The Extension was loaded successfully")
+        try:
+            # Before the first poll, which updates it from the log
+            await self.roster.load(self.bot.dbs, self.bot.service_id)
+        except Exception as e:
+            self.logger.error(f"Failed to load the online Players for {self.bot.service_id}: {e}")
         self.check_logs.start()
 
+    def cog_unload(self) -> None:
+        self.check_logs.cancel()
+        self.pipeline.close()
+        self.outbox.close()
+        # Stops listening once no other cog uses the settings either
+        asyncio.ensure_future(self.settings.release())
+
     async def loop(self) -> None:
+        if not self.schedule.due([self.bot.service_id]):
+            return
+
         tasks = []
+        lines = self.tail.lines
         log = await self.download_log()
         if log is True:
             tasks.append(self.check_logfile(self.bot.dayz_map))
@@ -129,1012 +189,937 @@ class Killfeed(commands.Cog):
             pass
         await asyncio.gather(*tasks)
 
-    @task.loop(minutes=2)
+        newLines = self.tail.lines - lines if self.tail.lines >= lines else self.tail.lines
+        await self.reschedule(newLines)
+
+    async def reschedule(self, newLines: int) -> None:
+        players = None
+        running = True
+        try:
+            if newLines:
+                # Clearly running, the player count last seen is good enough and costs no request
+                gameserver = self.bot.nitrado.cached_gameserver(self.bot.service_id)
+            else:
+                # About to back off, asked whether it's stopped or still has players
+                gameserver = await self.bot.nitrado.gameserver(self.bot.service_id)
+            if gameserver is not None:
+                running = gameserver.get("status") not in STOPPED
+                players = (gameserver.get("query") or {}).get("player_current")
+        except Exception as e:
+            self.logger.warning(f"Failed to get the Server Status for {self.bot.service_id}: {e}")
+
+        delay = self.schedule.plan(self.bot.service_id, new_lines=newLines, players=players, running=running)
+        self.logger.info(f"Next Log Check for {self.bot.service_id} in {delay:.0f}s")
+
+    # Only checks whether the log is due, how often that is is up to self.schedule
+    @task.loop(seconds=10)
     async def check_logs(self) -> None:
         await self.loop()
 
     async def download_log(self) -> bool:
-        async with ClientSession() as sess:
-            headers = {"Authorization": f"Bearer {self.bot.nitrado_token}"}
-            async with sess.get(
-                f"https://api.nitrado.net/services/{self.bot.service_id}/gameservers",
-                headers=headers,
-            ) as res:
-                if res.status != 200:
-                    self.logger.error(
-                        f"Failed to download the Log File for {self.bot.service_id}"
-                    )
-                    return False
+        try:
+            log_path = await self.bot.nitrado.log_path(self.bot.service_id)
+        except NitradoError:
+            self.logger.error(
+                f"Failed to download the Log File for {self.bot.service_id}"
+            )
+            return False
 
-                else:
-                    json = await res.json()
+        if log_path is None:
+            self.logger.error(f"PC Servers are not supported")
+            return False
 
-                    username = json["data"]["gameserver"]["username"]
-                    game = json["data"]["gameserver"]["game"].lower()
+        size = None
+        if self.changes.probe:
+            try:
+                size = await self.bot.nitrado.file_size(self.bot.service_id, log_path)
+            except NitradoError as e:
+                if 400 <= e.status < 500:
+                    self.logger.warning(f"Log size probe isn't supported ({e.status}), no longer probing")
+                    self.changes.probe = False
+            if size is not None and self.tail.offset and self.changes.unchanged_size(self.bot.service_id, size):
+                self.logger.info(f"Log for {self.bot.service_id} didn't change, skipping download")
+                return False
 
-                    if game == "dayzps":
-                        log_path = "dayzps/config/DayZServer_PS4_x64.ADM"
+        async with self.bot.nitrado.get(
+            f"/services/{self.bot.service_id}/gameservers/file_server/download?file={log_path}",
+        ) as resp:
+            if resp.status != 200:
+                self.logger.error(
+                    f"Failed to download the Log File for {self.bot.service_id}"
+                )
+                self.bot.nitrado.forget_log_path(self.bot.service_id)
+                return False
 
-                    elif game == "dayzxb":
-                        log_path = "dayzxb/config/DayZServer_X1_x64.ADM"
+            else:
+                json = await resp.json()
 
-                    else:
-                        self.logger.error(f"PC Servers are not supported")
+                url = json["data"]["token"]["url"]
+
+                headers = self.changes.conditional_headers(self.bot.service_id) if self.tail.offset else {}
+                async with self.bot.nitrado.get(f"{url}", auth=True, headers=headers) as response:
+                    if response.status == 304:
+                        self.logger.info(f"Log for {self.bot.service_id} wasn't modified, skipping it")
+                        return False
+
+                    elif response.status != 200:
+                        self.logger.error(
+                            f"Failed to download the Log File for {self.bot.service_id}"
+                        )
+                        self.bot.nitrado.forget_log_path(self.bot.service_id)
                         return False
 
-                    async with sess.get(
-                        f"https://api.nitrado.net/services/{self.bot.service_id}/gameservers/file_server/download?file=/games/{username}/noftp/{log_path}",
-                        headers=headers,
-                    ) as resp:
-                        if resp.status != 200:
-                            self.logger.error(
-                                f"Failed to download the Log File for {self.bot.service_id}"
-                            )
+                    else:
+                        # Lines before the checkpoint are skipped when the log is read
+                        self.tail.accept(response.status)
+                        length = await stream_to_file(
+                            response, f"./logs/{self.bot.service_id}.adm"
+                        )
+                        self.changes.downloaded(self.bot.service_id, response.headers, size)
+
+                        self.logger.info(
+                            f"Downloaded Log for {self.bot.service_id} successfully"
+                        )
+
+                        digest = await file_fingerprint(f"./logs/{self.bot.service_id}.adm", length)
+                        if self.changes.unchanged_fingerprint(self.bot.service_id, digest) and self.tail.offset:
+                            self.logger.info(f"Log for {self.bot.service_id} is the same as last time, skipping it")
                             return False
+                        return True
 
-                        else:
-                            json = await resp.json()
+    async def zone_alarm(self, zone, c: float, x: float, z: float, playerName: str, time: str, dayz_map: str) -> None:
+        zoneName = zone.name
+        zoneID = zone.id
 
-                            url = json["data"]["token"]["url"]
+        if dayz_map == "livonia":
+            mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+        else:
+            mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
 
-                            async with sess.get(f"{url}", headers=headers) as response:
-                                if response.status != 200:
-                                    self.logger.error(
-                                        f"Failed to download the Log File for {self.bot.service_id}"
-                                    )
-                                    return False
+        if 0 < c < 2:
+            distanceText = "meter"
+        else:
+            distanceText = "meters"
 
-                                else:
-                                    async with open(
-                                        f"./logs/{self.bot.service_id}.adm", mode="wb+"
-                                    ) as file:
-                                        await file.write(await response.read())
-                                        await file.close()
+        embed = discord.Embed(
+            title=f"**:rotating_light: Zone Alarm | {zoneName} :rotating_light:**",
+            description=f"_A Player was detected within {c} {distanceText} of the Zone {zoneName}._",
+            color=0xDA0C0C,
+        )
 
-                                    self.logger.info(
-                                        f"Downloaded Log for {self.bot.service_id} successfully"
-                                    )
-                                    return True
+        embed.add_field(
+            name="__**Player IGN**__",
+            value=f"```\n{playerName}```",
+            inline=False,
+        )
+        embed.add_field(
+            name="__**Server Time**__",
+            value=f"```\n{time}```",
+            inline=False,
+        )
+        embed.add_field(
+            name="__**Player Location**__",
+            value=f"{mapURL}",
+            inline=False,
+        )
+
+        embed.set_footer(
+            text=f"{zoneName} | {zoneID}",
+            icon_url=self.bot.user.avatar_url,
+        )
+
+        channel = self.bot.get_channel(860231409369481217)
+        await self.outbox.send(channel, embed)
 
     async def check_logfile(self, dayz_map: str) -> None:
         self.logger.info(f"Checking the Log for {self.bot.service_id}")
 
-        async with self.bot.db.acquire() as conn:
-            query = "SELECT * FROM service;"
-            serviceData = await conn.fetchrow(query)
+        # Kept current by the settings' LISTEN, no query per poll
+        serviceData = await self.settings.load()
 
         if self.bot.service_id not in self.read_lines:
-            self.read_lines[self.bot.service_id] = []
+            self.read_lines[self.bot.service_id] = SeenLines()
+
+        try:
+            await self.load_last_logins()
+        except Exception as e:
+            # Their playtime counts as 0 then, like for players without a login
+            self.logger.error(f"Failed to load the last Logins for {self.bot.service_id}: {e}")
 
-        async with open(f"./logs/{self.bot.service_id}.adm", mode="r") as file:
-            async for line in file:
-                if f"{str(line.strip())}" in self.read_lines[self.bot.service_id]:
+        poll = Poll(serviceData, dayz_map, await self.get_zones())
+        if self.unflushed is not None:
+            poll.batch, self.unflushed = self.unflushed, None
+
+        await self.pipeline.put(poll)
+        # A separate item, so it still gets through when reading the log blew up
+        await self.pipeline.put(PollEnd(poll))
+        await self.pipeline.join()
+
+        logging.info(f"Finished Checking the Log for {self.bot.service_id}")
+
+    async def persist(self, end: PollEnd) -> None:
+        poll = end.poll
+        for index, zone, c in poll.zones.near_many([(x, z) for x, z, _, _ in poll.positions]):
+            x, z, playerName, time = poll.positions[index]
+            if zone.alerts(playerName):
+                await self.zone_alarm(zone, c, x, z, playerName, time, poll.dayz_map)
+
+        if poll.batch:
+            try:
+                async with self.bot.dbs.acquire() as conn:
+                    await poll.batch.flush(conn, str(self.bot.service_id))
+            except Exception as e:
+                # Rolled back as a whole, the next poll adds its lines to it and writes it again
+                self.logger.error(f"Failed to save the Stats for {self.bot.service_id}: {type(e).__name__}: {e}")
+                self.unflushed = poll.batch
+
+        if self.unflushed is None:
+            # Saved once the poll's stats are in, so a crash neither posts the session again nor loses them
+            self.checkpoints.save(self.bot.service_id, self.tail)
+
+        self.logger.info(f"Queued: {self.pipeline.depths()}, {self.outbox.pending()} embeds")
+
+    async def publish(self, item):
+        if isinstance(item, PollEnd):
+            return item
+        channel, embed = item
+        await self.outbox.send(channel, embed)
+
+    async def read_log(self, poll: Poll):
+        if isinstance(poll, PollEnd):
+            yield poll
+            return
+
+        async with open(f"./logs/{self.bot.service_id}.adm", mode="rb") as file:
+            if self.tail.start:
+                # Only the bytes read last are checked, not everything before them
+                await file.seek(self.tail.overlap())
+                if not self.tail.matches(await file.read(self.tail.start - self.tail.overlap())):
+                    # Not the log the checkpoint was taken from, the server started a new one
+                    self.tail.reset()
+            await file.seek(self.tail.start)
+
+            async for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                self.tail.advance(raw)
+                line = raw.decode("utf-8", errors="replace")
+
+                if not self.read_lines[self.bot.service_id].add(line):
                     print("Double")
                     continue
 
-                if "AdminLog" in line:
-                    if self.last_logfile not in str(line):
-                        print("New Log")
-                        self.last_logfile = str(line)
-                        self.read_lines[self.bot.service_id] = []
+                event = adm.parse_line(line)
+                self.recent_events.append(event)
 
-                self.read_lines[self.bot.service_id].append(str(line).strip())
+                if event is not None and event.kind == adm.HEADER:
+                    if self.tail.header != raw.strip():
+                        print("New Log")
+                        self.tail.header = raw.strip()
+                        self.read_lines[self.bot.service_id].clear()
+                        self.read_lines[self.bot.service_id].add(line)
 
                 if (
-                    "Player" in line
-                    and not "Unknown/Dead Entity" in line
-                    and not "PlayerList log" in line
+                    event is not None
+                    and event.player_id is not None
                     and not "Unknown" in line
                 ):
-                    playerID = (
-                        str(re.search(r"id=(.*?\s)", line).group(1))
-                        .replace(")", "")
-                        .replace("=", "")
-                    )
-                    playerID = re.sub(r"\s+", "", playerID, re.MULTILINE)
-                    playerName = str(re.search(r'[\'"](.*?)[\'"]', line).group(1))
-                    time = str(re.search("(\\d+:\\d+:\\d+)", line).group(1))
-
-                    if (
-                        not "is connected" in line
-                        and not "has been disconnected" in line
-                        and "pos" in line
-                        and not "killed by Player" in line
-                        and not "hit by" in line
-                        and not "died." in line
-                        and not "is unconscious" in line
-                        and not "regained consciousness" in line
-                    ):
-                        locationLog = (
-                            str(re.search(r"pos=<(.*?)>", line).group(1))
-                            .replace(" ", "")
-                            .split(",")
-                        )
-                        x = float(locationLog[0])
-                        z = float(locationLog[1])
-
-                        await self.insert_player(playerName, playerID)
-
-                        zones = await self.get_zones()
-
-                        if not not zones:
-                            for zone in zones:
-                                zoneCoordX = zone["x_coord"]
-                                zoneCoordZ = zone["z_coord"]
-                                zoneRadius = zone["radius"]
-                                zoneWhitelist = zone["no_alert"]
-                                zoneName = zone["name"]
-                                zoneID = zone["id"]
-                                zoneChannelID = int(zone["channel"])
-
-                                a = zoneCoordX - x
-                                b = zoneCoordZ - z
-                                c = round(sqrt(a * a + b * b), 2)
-
-                                if c < zoneRadius and not playerName in zoneWhitelist:
-                                    if dayz_map == "livonia":
-                                        mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
-                                    else:
-                                        mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
-
-                                    channel = self.bot.get_channel(zoneChannelID)
-                                    if channel is None:
-                                        pass
-
-                                    if 0 < c < 2:
-                                        distanceText = "meter"
-                                    else:
-                                        distanceText = "meters"
-
-                                    embed = discord.Embed(
-                                        title=f"**:rotating_light: Zone Alarm | {zoneName} :rotating_light:**",
-                                        description=f"_A Player was detected within {c} {distanceText} of the Zone {zoneName}._",
-                                        color=0xDA0C0C,
-                                    )
-
-                                    embed.add_field(
-                                        name="__**Player IGN**__",
-                                        value=f"```\n{playerName}```",
-                                        inline=False,
-                                    )
-                                    embed.add_field(
-                                        name="__**Server Time**__",
-                                        value=f"```\n{time}```",
-                                        inline=False,
-                                    )
-                                    embed.add_field(
-                                        name="__**Player Location**__",
-                                        value=f"{mapURL}",
-                                        inline=False,
-                                    )
-
-                                    embed.set_footer(
-                                        text=f"{zoneName} | {zoneID}",
-                                        icon_url=self.bot.user.avatar_url,
-                                    )
-
-                                    channel = self.bot.get_channel(860231409369481217)
-                                    await channel.send(embed=embed)
-
-                        async with self.bot.dbs.acquire() as conn:
-                            query = f"""INSERT INTO "{self.bot.service_id}" (player_id, player_name, last_pos_x, last_pos_z, online) 
-                                        VALUES ($1, $2, $3, $4, $5) ON CONFLICT (player_id) DO UPDATE 
-                                        SET (player_name, last_pos_x, last_pos_z, online) = ($2, $3, $4, $5);"""
-                            await conn.execute(
-                                query, playerID, playerName, float(x), float(z), True
-                            )
-
-                    if "placed" in line:
-                        await self.insert_player(playerName, playerID)
-                        if serviceData["build_feed"] is True:
-                            locationLog = (
-                                str(re.search(r"pos=<(.*?)>", line).group(1))
-                                .replace(" ", "")
-                                .split(",")
-                            )
-                            x = float(locationLog[0])
-                            z = float(locationLog[1])
-                            placedItem = str(re.search(r"placed (.*)", line).group(1))
-
-                            if dayz_map == "livonia":
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
-                            else:
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
-
-                            embed = discord.Embed(
-                                title="**:tools: Placement Log :tools:**",
-                                color=0xB4BB05,
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Item**__",
-                                value=f"```\n{placedItem}```",
-                                inline=False,
-                            )
-                            embed.add_field(
-                                name="__**Player Location**__",
-                                value=f"{mapURL}",
-                                inline=False,
-                            )
-
-                            embed.set_footer(
-                                text="Placement Log", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["build_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                    if "built" in line and "with" in line:
-                        await self.insert_player(playerName, playerID)
-                        if serviceData["build_feed"] is True:
-                            locationLog = (
-                                str(re.search(r"pos=<(.*?)>", line).group(1))
-                                .replace(" ", "")
-                                .split(",")
-                            )
-                            x = float(locationLog[0])
-                            z = float(locationLog[1])
-                            builtPart = str(
-                                re.search(r"built (.*?) with", line).group(1)
-                            )
-                            if builtPart == "#STR_CFGVEHICLES_CONSTRUCTION_PART_GATE":
-                                builtPart = "Gate"
-                            builtTool = str(re.search(r"with (.*)", line).group(1))
-
-                            if dayz_map == "livonia":
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
-                            else:
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
-
-                            embed = discord.Embed(
-                                title="**:hammer: Building Log :hammer:**",
-                                color=0x1C9C15,
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Part**__",
-                                value=f"```\n{builtPart}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Tool**__",
-                                value=f"```\n{builtTool}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Player Location**__",
-                                value=f"{mapURL}",
-                                inline=False,
-                            )
-
-                            embed.set_footer(
-                                text="Building Log", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["build_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                    if "dismantled" in line and "with" in line:
-                        await self.insert_player(playerName, playerID)
-                        if serviceData["build_feed"] is True:
-                            locationLog = (
-                                str(re.search(r"pos=<(.*?)>", line).group(1))
-                                .replace(" ", "")
-                                .split(",")
-                            )
-                            x = float(locationLog[0])
-                            z = float(locationLog[1])
-                            dismantledPart = str(
-                                re.search(r"dismantled (.*?) with", line).group(1)
-                            )
-                            if (
-                                dismantledPart
-                                == "#STR_CFGVEHICLES_CONSTRUCTION_PART_GATE"
-                            ):
-                                dismantledPart = "Gate"
-                            dismantledTool = str(re.search(r"with (.*)", line).group(1))
-
-                            if dayz_map == "livonia":
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
-                            else:
-                                mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
-
-                            embed = discord.Embed(
-                                title="**:axe: Dismantling Log :axe:**",
-                                color=0xDA0C0C,
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Part**__",
-                                value=f"```\n{dismantledPart}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Tool**__",
-                                value=f"```\n{dismantledTool}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Player Location**__",
-                                value=f"{mapURL}",
-                                inline=False,
-                            )
-
-                            embed.set_footer(
-                                text="Dismantling Log",
-                                icon_url=self.bot.user.avatar_url,
-                            )
-
-                            channelID = serviceData["build_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                    if "is connected" in line:
-                        await self.insert_player(playerName, playerID)
-                        loginTime = f"{str(datetime.date.today())} {time}"
-                        async with self.bot.dbs.acquire() as conn:
-                            query = f'UPDATE "{self.bot.service_id}" SET last_login = $1 WHERE player_id = $2;'
-                            await conn.execute(query, loginTime, playerID)
-                        await self.set_status(playerID, playerName, True)
-
-                        if serviceData["con_logs"] is True:
-                            embed = discord.Embed(
-                                title="**:globe_with_meridians: New Connect :globe_with_meridians:**",
-                                description="_A Player joined the Server._",
-                                color=0x1C9C15,
-                            )
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.set_footer(
-                                text="Connection Log", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["con_logs_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                    if "has been disconnected" in line and not "Unknown" in line:
-                        await self.insert_player(playerName, playerID)
-                        logoutTime = f"{str(datetime.date.today())} {time}"
-                        await self.set_status(playerID, playerName, False)
-                        await self.calculate_online_time(playerID, logoutTime)
-
-                        if serviceData["con_logs"] is True:
-                            async with self.bot.dbs.acquire() as conn:
-                                query = f'SELECT last_login FROM "{self.bot.service_id}" WHERE player_id = $1;'
-                                lastLoginDB = await conn.fetchval(query, playerID)
-
-                            timeLastLogin = datetime.datetime.strptime(
-                                str(lastLoginDB), "%Y-%m-%d %H:%M:%S"
-                            )
-                            timeLogout = datetime.datetime.strptime(
-                                logoutTime, "%Y-%m-%d %H:%M:%S"
-                            )
-                            playtime = (timeLogout - timeLastLogin).total_seconds()
-
-                            m, s = divmod(playtime, 60)
-                            h, m = divmod(m, 60)
-                            if int(h) == 0 and int(m) == 0:
-                                if 0 < s < 2:
-                                    timeString = f"{s} second"
-                                else:
-                                    timeString = f"{s} seconds"
-                            elif int(h) == 0 and int(m) != 0:
-                                if 0 < m < 2:
-                                    if 0 < s < 2:
-                                        timeString = f"{m} minute and {s} second"
-                                    else:
-                                        timeString = f"{m} minute and {s} seconds"
-                                else:
-                                    if 0 < s < 2:
-                                        timeString = f"{m} minutes and {s} second"
-                                    else:
-                                        timeString = f"{m} minutes and {s} seconds"
-                            else:
-                                if 0 < h < 2:
-                                    if 0 < m < 2:
-                                        if 0 < s < 2:
-                                            timeString = (
-                                                f"{h} hour, {m} minute and {s} second"
-                                            )
-                                        else:
-                                            timeString = (
-                                                f"{h} hour, {m} minute and {s} seconds"
-                                            )
-                                    else:
-                                        if 0 < s < 2:
-                                            timeString = (
-                                                f"{h} hour, {m} minutes and {s} second"
-                                            )
-                                        else:
-                                            timeString = (
-                                                f"{h} hour, {m} minutes and {s} seconds"
-                                            )
-
-                                else:
-                                    if 0 < m < 2:
-                                        if 0 < s < 2:
-                                            timeString = (
-                                                f"{h} hours, {m} minute and {s} second"
-                                            )
-                                        else:
-                                            timeString = (
-                                                f"{h} hours, {m} minute and {s} seconds"
-                                            )
-                                    else:
-                                        if 0 < s < 2:
-                                            timeString = (
-                                                f"{h} hours, {m} minutes and {s} second"
-                                            )
-                                        else:
-                                            timeString = f"{h} hours, {m} minutes and {s} seconds"
-
-                            embed = discord.Embed(
-                                title="**:globe_with_meridians: New Disconnect :globe_with_meridians:**",
-                                description="_A Player left the Server._",
-                                color=0xDA0C0C,
-                            )
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Playtime**__",
-                                value=f"```\n{timeString}```",
-                                inline=False,
-                            )
-
-                            embed.set_footer(
-                                text="Connection Log",
-                                icon_url=self.bot.user.avatar_url,
-                            )
-
-                        channelID = serviceData["con_logs_channel"]
-                        channel = self.bot.get_channel(int(channelID))
-                        if channel is None:
-                            pass
-
-                        try:
-                            await channel.send(embed=embed)
-                            await asyncio.sleep(2)
-                        except discord.Forbidden or discord.HTTPException:
-                            pass
-
-                    elif (
-                        "(DEAD)" in line
-                        or "committed suicide" in line
-                        and not "Survivor"
-                    ):
-                        locationLog = (
-                            str(re.search(r"pos=<(.*?)>", line).group(1))
-                            .replace(" ", "")
-                            .split(",")
-                        )
-                        x = float(locationLog[0])
-                        z = float(locationLog[1])
+                    # The line before is handed along, a PvP kill takes the hit details from it
+                    yield poll, line, event, self.recent_events[0]
+
+    async def handle_line(self, item):
+        if isinstance(item, PollEnd):
+            yield item
+            return
+
+        poll, line, event, previous = item
+        serviceData, dayz_map, batch, positions = poll.service, poll.dayz_map, poll.batch, poll.positions
+
+        playerID = event.player_id.replace("=", "")
+        playerName = event.player
+        time = event.time
+
+        if event.kind in POSITION_KINDS and event.pos is not None:
+            x, z = event.pos[0], event.pos[1]
+
+            batch.seen(playerID, playerName)
+            batch.move(playerID, x, z)
+            self.roster.move(playerID, playerName, x, z)
+
+            # Checked against the zones all at once after the last line
+            positions.append((x, z, playerName, time))
 
-                        if dayz_map == "livonia":
-                            mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+        if event.kind == adm.PLACED:
+            batch.seen(playerID, playerName)
+            if serviceData.build_feed:
+                x, z = event.pos[0], event.pos[1]
+                placedItem = event.item
+
+                if dayz_map == "livonia":
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+                else:
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
+
+                embed = discord.Embed(
+                    title="**:tools: Placement Log :tools:**",
+                    color=0xB4BB05,
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Item**__",
+                    value=f"```\n{placedItem}```",
+                    inline=False,
+                )
+                embed.add_field(
+                    name="__**Player Location**__",
+                    value=f"{mapURL}",
+                    inline=False,
+                )
+
+                embed.set_footer(
+                    text="Placement Log", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.build_feed_channel
+                channel = self.bot.get_channel(channelID)
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+        if event.kind == adm.BUILT:
+            batch.seen(playerID, playerName)
+            if serviceData.build_feed:
+                x, z = event.pos[0], event.pos[1]
+                builtPart = event.item
+                if builtPart == "#STR_CFGVEHICLES_CONSTRUCTION_PART_GATE":
+                    builtPart = "Gate"
+                builtTool = event.weapon
+
+                if dayz_map == "livonia":
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+                else:
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
+
+                embed = discord.Embed(
+                    title="**:hammer: Building Log :hammer:**",
+                    color=0x1C9C15,
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Part**__",
+                    value=f"```\n{builtPart}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Tool**__",
+                    value=f"```\n{builtTool}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Player Location**__",
+                    value=f"{mapURL}",
+                    inline=False,
+                )
+
+                embed.set_footer(
+                    text="Building Log", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.build_feed_channel
+                channel = self.bot.get_channel(channelID)
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+        if event.kind == adm.DISMANTLED:
+            batch.seen(playerID, playerName)
+            if serviceData.build_feed:
+                x, z = event.pos[0], event.pos[1]
+                dismantledPart = event.item
+                if (
+                    dismantledPart
+                    == "#STR_CFGVEHICLES_CONSTRUCTION_PART_GATE"
+                ):
+                    dismantledPart = "Gate"
+                dismantledTool = event.weapon
+
+                if dayz_map == "livonia":
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+                else:
+                    mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
+
+                embed = discord.Embed(
+                    title="**:axe: Dismantling Log :axe:**",
+                    color=0xDA0C0C,
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Part**__",
+                    value=f"```\n{dismantledPart}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Tool**__",
+                    value=f"```\n{dismantledTool}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Player Location**__",
+                    value=f"{mapURL}",
+                    inline=False,
+                )
+
+                embed.set_footer(
+                    text="Dismantling Log",
+                    icon_url=self.bot.user.avatar_url,
+                )
+
+                channelID = serviceData.build_feed_channel
+                channel = self.bot.get_channel(channelID)
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+        if event.kind == adm.CONNECT:
+            loginTime = f"{str(datetime.date.today())} {time}"
+            batch.seen(playerID, playerName, True)
+            self.roster.connect(playerID, playerName)
+            batch.login(playerID, loginTime)
+            self.last_logins[playerID] = loginTime
+
+            if serviceData.con_logs:
+                embed = discord.Embed(
+                    title="**:globe_with_meridians: New Connect :globe_with_meridians:**",
+                    description="_A Player joined the Server._",
+                    color=0x1C9C15,
+                )
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.set_footer(
+                    text="Connection Log", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.con_logs_channel
+                channel = self.bot.get_channel(channelID)
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+        if event.kind == adm.DISCONNECT:
+            logoutTime = f"{str(datetime.date.today())} {time}"
+            batch.seen(playerID, playerName, False)
+            self.roster.disconnect(playerID)
+
+            lastLoginDB = self.last_login(playerID)
+            if lastLoginDB is not None:
+                timeLastLogin = datetime.datetime.strptime(
+                    str(lastLoginDB), "%Y-%m-%d %H:%M:%S"
+                )
+                timeLogout = datetime.datetime.strptime(
+                    logoutTime, "%Y-%m-%d %H:%M:%S"
+                )
+                playtime = (timeLogout - timeLastLogin).total_seconds()
+            else:
+                playtime = 0
+            batch.playtime(playerID, int(playtime))
+
+            if serviceData.con_logs:
+                m, s = divmod(playtime, 60)
+                h, m = divmod(m, 60)
+                if int(h) == 0 and int(m) == 0:
+                    if 0 < s < 2:
+                        timeString = f"{s} second"
+                    else:
+                        timeString = f"{s} seconds"
+                elif int(h) == 0 and int(m) != 0:
+                    if 0 < m < 2:
+                        if 0 < s < 2:
+                            timeString = f"{m} minute and {s} second"
+                        else:
+                            timeString = f"{m} minute and {s} seconds"
+                    else:
+                        if 0 < s < 2:
+                            timeString = f"{m} minutes and {s} second"
                         else:
-                            mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
-
-                        if "committed suicide" in line:
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:skull_crossbones: Suicide :skull_crossbones:**",
-                                color=0xDA0C0C,
-                                description="_Someone committed Suicide._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                            timeString = f"{m} minutes and {s} seconds"
+                else:
+                    if 0 < h < 2:
+                        if 0 < m < 2:
+                            if 0 < s < 2:
+                                timeString = (
+                                    f"{h} hour, {m} minute and {s} second"
                                 )
-
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if "killed by Player" in line:
-                            killerName = str(
-                                re.search(r'killed by Player "(.*?)"', line).group(1)
-                            )
-                            killerID = (
-                                re.findall(r"id=(.*?\s)", line)[1]
-                                .replace(")", "")
-                                .replace("=", "")
-                                .replace(" ", "")
-                            )
-                            weapon = str(
-                                re.search(r" with (.*) from", line).group(1)
-                                or re.search(r"with (.*)", line).group(1)
-                            )
-                            currentLineIndex = len(self.read_lines[self.bot.service_id])
-                            hitLine = self.read_lines[self.bot.service_id][
-                                currentLineIndex - 2
-                            ]
-                            if not "from" in line and not "meters" in line:
-                                distance = 0.0
                             else:
-                                try:
-                                    distance = round(
-                                        float(
-                                            re.search(
-                                                r"from ([0-9.]+) meters", line
-                                            ).group(1)
-                                        ),
-                                        2,
-                                    )
-                                except AttributeError:
-                                    distance = 0.0
-                            bodyPart = str(
-                                re.search(r"into (.*?) for", hitLine)
-                                .group(1)
-                                .split("(")[0]
-                            )
-                            damageValue = str(
-                                re.search(r"for (.*?) damage", hitLine).group(1)
-                            )
-
-                            # Update Killer's Data
-                            async with self.bot.db.acquire() as conn:
-                                query = f'SELECT longest_kill_distance, longest_kill_weapon FROM "{self.bot.service_id}" WHERE player_id = $1'
-                                killerData = await conn.fetchrow(query, killerID)
-
-                            await self.increment("kills", killerID, 1)
-                            await self.increment("killstreak", killerID, 1)
-                            await self.reset("deathstreak", killerID)
-                            if float(killerData["longest_kill_distance"]) <= distance:
-                                async with self.bot.dbs.acquire() as conn:
-                                    query = f'UPDATE "{self.bot.service_id}" SET (longest_kill_distance, longest_kill_weapon) = ($1, $2) WHERE player_id = $3;'
-                                    await conn.execute(
-                                        query, float(distance), weapon, killerID
-                                    )
-
-                            # Update Victim's Data
-                            await self.increment("pvp_deaths", playerID, 1)
-                            await self.increment("deathstreak", playerID, 1)
-                            await self.reset("killstreak", killerID)
-
-                            embed = discord.Embed(
-                                title="**:skull_crossbones: PvP Kill :skull_crossbones:**",
-                                color=0xDA0C0C,
-                                description=f"_`{playerName}` was killed by `{killerName}`._",
-                            )
-
-                            embed.add_field(
-                                name="__**Killer IGN**__",
-                                value=f"```\n{killerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Victim IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Kill Data**__",
-                                value=f"```\nHit: {bodyPart}\nDamage: {damageValue}\nWeapon: {weapon}\nDistance: {distance}m```",
-                                inline=False,
-                            )
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Kill Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                                timeString = (
+                                    f"{h} hour, {m} minute and {s} seconds"
                                 )
-
-                            embed.set_footer(
-                                text="PvP Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pvp_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if "bled out" in line:
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:drop_of_blood: Suicide :drop_of_blood:**",
-                                color=0xDA0C0C,
-                                description="_Someone bled out._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                        else:
+                            if 0 < s < 2:
+                                timeString = (
+                                    f"{h} hour, {m} minutes and {s} second"
                                 )
-
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if (
-                            "Animal_CanisLupus_Grey" in line
-                            or "Animal_CanisLupus_White" in line
-                        ):
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:wolf: Bear Death :wolf:**",
-                                color=0xDA0C0C,
-                                description="_Someone was killed by a Wolf._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                            else:
+                                timeString = (
+                                    f"{h} hour, {m} minutes and {s} seconds"
                                 )
 
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if "Animal_UrsusArctos" in line or "Brown Bear" in line:
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:bear: Bear Death :bear:**",
-                                color=0xDA0C0C,
-                                description="_Someone was killed by a Bear._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                    else:
+                        if 0 < m < 2:
+                            if 0 < s < 2:
+                                timeString = (
+                                    f"{h} hours, {m} minute and {s} second"
                                 )
-
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if "hit by FallDamage" in line:
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:skull_crossbones: Fall Death :skull_crossbones:**",
-                                color=0xDA0C0C,
-                                description="_Someone fell to his Death._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                            else:
+                                timeString = (
+                                    f"{h} hours, {m} minute and {s} seconds"
                                 )
-
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if (
-                            "died." in line
-                            and not "killed by Player" in line
-                            and not "bled out" in line
-                        ):
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:skull_crossbones: Death :skull_crossbones:**",
-                                color=0xDA0C0C,
-                                description="_Someone died._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
+                        else:
+                            if 0 < s < 2:
+                                timeString = (
+                                    f"{h} hours, {m} minutes and {s} second"
                                 )
+                            else:
+                                timeString = f"{h} hours, {m} minutes and {s} seconds"
+
+                embed = discord.Embed(
+                    title="**:globe_with_meridians: New Disconnect :globe_with_meridians:**",
+                    description="_A Player left the Server._",
+                    color=0xDA0C0C,
+                )
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Playtime**__",
+                    value=f"```\n{timeString}```",
+                    inline=False,
+                )
+
+                embed.set_footer(
+                    text="Connection Log",
+                    icon_url=self.bot.user.avatar_url,
+                )
+
+                channelID = serviceData.con_logs_channel
+                channel = self.bot.get_channel(channelID)
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+        elif event.kind in adm.DEATHS and event.pos is not None:
+            x, z = event.pos[0], event.pos[1]
+
+            if dayz_map == "livonia":
+                mapURL = f"[{x}, {z}](https://www.izurvive.com/livonia/#location={x};{z})"
+            else:
+                mapURL = f"[{x}, {z}](https://www.izurvive.com/#location={x};{z})"
+
+            if event.kind == adm.SUICIDE:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:skull_crossbones: Suicide :skull_crossbones:**",
+                    color=0xDA0C0C,
+                    description="_Someone committed Suicide._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
 
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
-
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
-
-                            if channel is None:
-                                pass
-
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
-
-                        if "killed by ZmbM" in line:
-                            await self.increment("pve_deaths", playerID, 1)
-
-                            embed = discord.Embed(
-                                title="**:man_zombie: Zombie Death :man_zombie:**",
-                                color=0xDA0C0C,
-                                description="_Someone was killed by a Zombie._",
-                            )
-
-                            embed.add_field(
-                                name="__**Player IGN**__",
-                                value=f"```\n{playerName}```",
-                                inline=False,
-                            )
-
-                            embed.add_field(
-                                name="__**Server Time**__",
-                                value=f"```\n{time}```",
-                                inline=False,
-                            )
-
-                            if serviceData["location"] is True:
-                                embed.add_field(
-                                    name="__**Player Location**__",
-                                    value=f"{mapURL}",
-                                    inline=False,
-                                )
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
 
-                            embed.set_footer(
-                                text="PvE Feed", icon_url=self.bot.user.avatar_url
-                            )
+                yield channel, embed
 
-                            channelID = serviceData["pve_feed_channel"]
-                            channel = self.bot.get_channel(int(channelID))
+            if event.kind == adm.PVP:
+                killerName = event.killer
+                killerID = event.killer_id.replace("=", "")
+                weapon = event.weapon
+                distance = event.distance
+                hitEvent = previous
+                if hitEvent is not None and hitEvent.kind == adm.HIT:
+                    bodyPart = hitEvent.item
+                    damageValue = hitEvent.damage
+                else:
+                    bodyPart = damageValue = "Unknown"
+
+                # Killer's and victim's stats
+                batch.kill(killerID, playerID, distance, weapon)
+
+                embed = discord.Embed(
+                    title="**:skull_crossbones: PvP Kill :skull_crossbones:**",
+                    color=0xDA0C0C,
+                    description=f"_`{playerName}` was killed by `{killerName}`._",
+                )
+
+                embed.add_field(
+                    name="__**Killer IGN**__",
+                    value=f"```\n{killerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Victim IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Kill Data**__",
+                    value=f"```\nHit: {bodyPart}\nDamage: {damageValue}\nWeapon: {weapon}\nDistance: {distance}m```",
+                    inline=False,
+                )
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Kill Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
 
-                            if channel is None:
-                                pass
+                embed.set_footer(
+                    text="PvP Feed", icon_url=self.bot.user.avatar_url
+                )
 
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(2)
-                            except discord.Forbidden or discord.HTTPException:
-                                pass
+                channelID = serviceData.pvp_feed_channel
+                channel = self.bot.get_channel(channelID)
 
-        logging.info(f"Finished Checking the Log for {self.bot.service_id}")
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.BLED_OUT:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:drop_of_blood: Suicide :drop_of_blood:**",
+                    color=0xDA0C0C,
+                    description="_Someone bled out._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.WOLF:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:wolf: Bear Death :wolf:**",
+                    color=0xDA0C0C,
+                    description="_Someone was killed by a Wolf._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.BEAR:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:bear: Bear Death :bear:**",
+                    color=0xDA0C0C,
+                    description="_Someone was killed by a Bear._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.FALL:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:skull_crossbones: Fall Death :skull_crossbones:**",
+                    color=0xDA0C0C,
+                    description="_Someone fell to his Death._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.DIED:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:skull_crossbones: Death :skull_crossbones:**",
+                    color=0xDA0C0C,
+                    description="_Someone died._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
+
+            if event.kind == adm.ZOMBIE:
+                batch.pve_death(playerID)
+
+                embed = discord.Embed(
+                    title="**:man_zombie: Zombie Death :man_zombie:**",
+                    color=0xDA0C0C,
+                    description="_Someone was killed by a Zombie._",
+                )
+
+                embed.add_field(
+                    name="__**Player IGN**__",
+                    value=f"```\n{playerName}```",
+                    inline=False,
+                )
+
+                embed.add_field(
+                    name="__**Server Time**__",
+                    value=f"```\n{time}```",
+                    inline=False,
+                )
+
+                if serviceData.location:
+                    embed.add_field(
+                        name="__**Player Location**__",
+                        value=f"{mapURL}",
+                        inline=False,
+                    )
+
+                embed.set_footer(
+                    text="PvE Feed", icon_url=self.bot.user.avatar_url
+                )
+
+                channelID = serviceData.pve_feed_channel
+                channel = self.bot.get_channel(channelID)
+
+                if channel is None:
+                    pass
+
+                yield channel, embed
 
 
 def setup(bot) -> None:
@@ -1,25 +1,72 @@
 import asyncio
+import hashlib
+import json
 import logging
+import os
 import time
 
 import discord
-from aiohttp import ClientSession
 from discord import Embed
 from discord import Webhook, AsyncWebhookAdapter
 from discord.ext import commands
 from discord.ext import tasks as task
 
+from utils.nitrado import NitradoError
+from utils.settings import settings_of
+
+# Players shown in each ranking
+LEADERBOARD_SIZE = 15
+
+# Columns the rankings are ordered by (ties by name), each gets an index
+RANKED_COLUMNS = ("kills", "longest_kill_distance", "pvp_deaths")
+
+# The posted leaderboard message, its channel and the hash of the data it shows
+STATE_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache", "leaderboard.json"))
+
 
 class Leaderboard(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        self.state = self.load_state()
+        self.settings = settings_of(bot).use()
+
+    def load_state(self) -> dict:
+        try:
+            with open(STATE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self) -> None:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp = f"{STATE_FILE}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, STATE_FILE)
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         self.logger.info(f'Extension was loaded successfully')
+        try:
+            await self.create_indexes()
+        except Exception as e:
+            # Only makes the query faster, the leaderboard is posted without them
+            self.logger.error(f'Failed to create the Leaderboard indexes: {type(e).__name__}: {e}')
         self.post_lb.start()
 
+    def cog_unload(self) -> None:
+        self.post_lb.cancel()
+        asyncio.ensure_future(self.settings.release())
+
+    async def create_indexes(self) -> None:
+        async with self.bot.dbs.acquire() as conn:
+            for column in RANKED_COLUMNS:
+                # Replaced by the one that also covers the tiebreaker
+                await conn.execute(f'DROP INDEX IF EXISTS "{self.bot.service_id}_{column}_idx";')
+                query = f'CREATE INDEX IF NOT EXISTS "{self.bot.service_id}_{column}_rank_idx" ON "{self.bot.service_id}" ("{column}" DESC, "player_name");'
+                await conn.execute(query)
+
     @task.loop(minutes=5)
     async def post_lb(self) -> None:
         await self.run_loop()
@@ -27,12 +74,10 @@ class Leaderboard(commands.Cog):
     async def run_loop(self) -> None:
         tasks = []
 
-        async with self.bot.db.acquire() as conn:
-            query = 'SELECT * FROM service;'
-            service = await conn.fetchrow(query)
+        service = await self.settings.load()
 
-        autoLB = service['auto_lb']
-        webhookURL = service['webhook_url']
+        autoLB = service.auto_lb
+        webhookURL = service.webhook_url
 
         if autoLB is True and webhookURL is not None:
             tasks.append(self.leaderboard(webhookURL))
@@ -41,75 +86,91 @@ class Leaderboard(commands.Cog):
 
     async def leaderboard(self, webhook_url: str) -> None or discord.WebhookMessage:
         """
-            Posts the Leaderboard
+            Posts the Leaderboard, or edits the message posted before if the rankings changed
 
         Parameters
         ----------
         webhook_url : str
             The Webhook URL for the Leaderboard Channel
         """
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
-                    return
-                json = await res.json()
-                serverName = json['data']['gameserver']['settings']['config']['hostname']
-
-            async with sess.get(f'{webhook_url}') as res:
-                if res.status != 200:
-                    return
-                json = await res.json()
-                channelID = json['channel_id']
-
-        channel = self.bot.get_channel(int(channelID))
-        if channel is None:
+        try:
+            gameserver = await self.bot.nitrado.gameserver(self.bot.service_id)
+        except NitradoError:
             return
+        serverName = gameserver['settings']['config']['hostname']
 
         async with self.bot.dbs.acquire() as conn:
-            queryLength = f'SELECT * FROM "{self.bot.service_id}"'
-            players = await conn.fetch(queryLength)
-
-            queryKillData = f'SELECT "player_name", kills FROM "{self.bot.service_id}" WHERE kills > 0 ORDER BY kills DESC LIMIT 15;'
-            killData = await conn.fetch(queryKillData)
-
-            querySnipeData = f'SELECT "player_name", "longest_kill_distance" FROM "{self.bot.service_id}" WHERE "longest_kill_distance" > 0 ORDER BY "longest_kill_distance" DESC LIMIT 15;'
-            snipeData = await conn.fetch(querySnipeData)
-
-            queryDeathData = f'SELECT "player_name", "pvp_deaths" FROM "{self.bot.service_id}" WHERE "pvp_deaths" > 0 ORDER BY "pvp_deaths" DESC LIMIT 15;'
-            deathData = await conn.fetch(queryDeathData)
+            # The player count and all three rankings in one round trip, each ranking is read from its index.
+            # Ties are broken by name, so equal counts come back in the same order every time
+            query = f'''
+                SELECT
+                    (SELECT count(*) FROM "{self.bot.service_id}") AS players,
+                    ARRAY(SELECT ("player_name", kills) FROM "{self.bot.service_id}"
+                          WHERE kills > 0 ORDER BY kills DESC, "player_name" LIMIT {LEADERBOARD_SIZE}) AS kills,
+                    ARRAY(SELECT ("player_name", "longest_kill_distance") FROM "{self.bot.service_id}"
+                          WHERE "longest_kill_distance" > 0 ORDER BY "longest_kill_distance" DESC, "player_name" LIMIT {LEADERBOARD_SIZE}) AS snipes,
+                    ARRAY(SELECT ("player_name", "pvp_deaths") FROM "{self.bot.service_id}"
+                          WHERE "pvp_deaths" > 0 ORDER BY "pvp_deaths" DESC, "player_name" LIMIT {LEADERBOARD_SIZE}) AS deaths;
+            '''
+            data = await conn.fetchrow(query)
+
+        # The message stays as it is while nobody's rank changed
+        rankings = (serverName, data['players'], [tuple(row) for ranking in ('kills', 'snipes', 'deaths') for row in data[ranking]])
+        digest = hashlib.blake2b(repr(rankings).encode(), digest_size=16).hexdigest()
+        state = self.state if self.state.get('webhook_url') == webhook_url else {'webhook_url': webhook_url}
+        if state.get('message_id') is not None and state.get('digest') == digest:
+            return
 
         updateTime = time.ctime()
         infoEmbed = Embed(title=f'__**Leaderboard Update :-1:**__', color=0X000001, author='Nialta', icon_url='https://i.postimg.cc/HWJpYQR3/Startmenu-black-red.png',
-                            description=f'Server: **`{serverName}`**\nUpdated at: **{updateTime} (UTC+2)**\nPlayers: **{len(players)}**')
+                            description=f'Server: **`{serverName}`**\nUpdated at: **{updateTime} (UTC+2)**\nPlayers: **{data["players"]}**')
         killEmbed = Embed(title=f'__** ☥ ⭜ Most Kills ♔ ⸖**__', color=0XFFFFFF)
-        for index, playerData in enumerate(killData):
-            rank = index + 1
-            kills = playerData['kills']
-            playerName = playerData['player_name']
-
+        for rank, (playerName, kills) in enumerate(data['kills'], 1):
             killEmbed.add_field(name=f'**{rank}. {playerName}**', value=f'```\n{kills} Kills```')
         snipeEmbed = Embed(title=f'__**⸭ ⴲ ⯐  Farthest Confirmed Kill ⯐ ⴲ ⸭**__', color=0XFFFFFF)
-        for index, playerData in enumerate(snipeData):
-            rank = index + 1
-            distance = playerData['longest_kill_distance']
-            playerName = playerData['player_name']
-
+        for rank, (playerName, distance) in enumerate(data['snipes'], 1):
             snipeEmbed.add_field(name=f'**{rank}. {playerName}**', value=f'```\n{distance}m```')
         deathEmbed = Embed(title=f'__**☣  "You are dead." - Red Screen Appearances ☣**__',
                         color=0XFFFFFF)
-        for index, playerData in enumerate(deathData):
-            rank = index + 1
-            deaths = playerData['pvp_deaths']
-            playerName = playerData['player_name']
-
+        for rank, (playerName, deaths) in enumerate(data['deaths'], 1):
             deathEmbed.add_field(name=f'**{rank}. {playerName}**', value=f'```\n{deaths} deaths```')
-        await channel.purge()
-        async with ClientSession() as sess:
-            webhook = Webhook.from_url(f'{webhook_url}', adapter=AsyncWebhookAdapter(sess))
-            await webhook.send(embeds=[infoEmbed, killEmbed, snipeEmbed, deathEmbed], username=self.bot.user.name,
-                            avatar_url=self.bot.user.avatar_url)
+        embeds = [infoEmbed, killEmbed, snipeEmbed, deathEmbed]
+        webhook = Webhook.from_url(f'{webhook_url}', adapter=AsyncWebhookAdapter(self.bot.nitrado.session))
+
+        if state.get('message_id') is not None:
+            try:
+                await webhook.edit_message(state['message_id'], embeds=embeds)
+            except discord.NotFound:
+                # Deleted from the channel, posted again below
+                state['message_id'] = None
+            except discord.HTTPException as e:
+                self.logger.error(f'Failed to edit the Leaderboard: {e}')
+                return
+
+        if state.get('message_id') is None:
+            channel = await self.leaderboard_channel(webhook_url, state)
+            if channel is None:
+                return
+
+            await channel.purge()
+            message = await webhook.send(embeds=embeds, username=self.bot.user.name,
+                            avatar_url=self.bot.user.avatar_url, wait=True)
+            state['message_id'] = message.id
+
+        state['digest'] = digest
+        self.state = state
+        self.save_state()
+
+    async def leaderboard_channel(self, webhook_url: str, state: dict) -> discord.TextChannel or None:
+        # The webhook's channel never changes, it's only looked up for the first post
+        if state.get('channel_id') is None:
+            async with self.bot.nitrado.get(f'{webhook_url}') as res:
+                if res.status != 200:
+                    return None
+                data = await res.json()
+            state['channel_id'] = int(data['channel_id'])
+
+        return self.bot.get_channel(state['channel_id'])
 
 
 def setup(bot) -> None:
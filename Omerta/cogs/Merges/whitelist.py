@@ -1,17 +1,23 @@
-import io
 import logging
-import re
+import os
 
 import discord
-from aiohttp import ClientSession
-from discord import Embed, File
+from discord import Embed
 from discord.ext import commands
 
+from utils.nitrado import NitradoError
+from utils.paginator import Paginator
+from utils.playerlist import PlayerList, PlayerListSetting, read_names
+
+# Source of truth for `whitelist sync` when no names are given, one per line
+SOURCE_FILE = 'lists/whitelist.txt'
+
 
 class Whitelist(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        self.players = PlayerListSetting(bot.nitrado, bot.service_id, 'whitelist')
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -47,105 +53,110 @@ class Whitelist(commands.Cog):
 
     @whitelist.command(name='show', description='Shows the Whitelist of the Server.')
     async def show(self, ctx: commands.Context) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
-                    return await ctx.send(
-                    embed = Embed(title=f'\n » Nitrapi Error RSC »',
-                                timestamp=ctx.message.created_at, description=f'\n Nitrado API Error. Failed to request Information from the Server. (RSC: {res.status})'))
-                else:
-                    json = await res.json()
-                    wl = json['data']['gameserver']['settings']['general']['whitelist']
-                    embed = Embed(title=f'__**Whitelist**__', color=0X000001,
-                                timestamp=ctx.message.created_at, description=f'')
-                    embed.set_footer(icon_url=ctx.author.avatar_url, text=ctx.author.name)
-                    if wl == '':
-                        embed.description += '`Empty`'
-                        return await ctx.send(embed=embed)
-                    else:
-                        wlList = wl.split()
-                        embed.description += f'Whitelist User Count: {len(wlList)}'
-                        for userName in wlList:
-                            embed.description += f' \n > • {user Name}'
-                        if len(embed.description) > 2000:
-                            embed.description = re.sub(r'+', '', embed.description)
-                            whitelistFile = io.BytesIO(embed.description.encode('utf-8'))
-                            return await ctx.send(
-                                f'```\nThe Whitelist of the Server is too long to send it trough a '
-                                f'Embed.```',
-                                file=File(whitelistFile, 'whitelist.txt'))
-                        else:
-                            return await ctx.send(embed=embed)
-
-    @whitelist.command(name='add', description='Adds a User to the Whitelist of a Server.', usage='<User>')
+        try:
+            players = await self.players.load()
+        except NitradoError as e:
+            return await ctx.send(
+            embed = Embed(title=f'\n » Nitrapi Error RSC »',
+                        timestamp=ctx.message.created_at, description=f'\n Nitrado API Error. Failed to request Information from the Server. (RSC: {e.status})'))
+        if not players:
+            embed = Embed(title=f'__**Whitelist**__', color=0X000001,
+                        timestamp=ctx.message.created_at, description='`Empty`')
+            embed.set_footer(icon_url=ctx.author.avatar_url, text=ctx.author.name)
+            return await ctx.send(embed=embed)
+        else:
+            paginator = Paginator('__**Whitelist**__', list(players), header=f'Whitelist User Count: {len(players)}',
+                                  template=' > • {}')
+            return await paginator.start(ctx)
+
+    @whitelist.command(name='add', description='Adds one or more Users (one per line) to the Whitelist of a Server.', usage='<User> [User...]')
     async def add(self, ctx: commands.Context, *, ign: str) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
+        names = ign.splitlines()
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            added = players.update(names)
+            if not added:
+                return await ctx.send(f'{", ".join(names)} is already on the Whitelist of the Server.')
+            else:
+                try:
+                    await self.players.save(players)
+                except NitradoError as e:
                     return await ctx.send(
-                        f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {res.status})```')
-                else:
-                    json = await res.json()
-                    wl = json['data']['gameserver']['settings']['general']['whitelist']
-                    if re.search(f'{ign}', wl):
-                        return await ctx.send(f'{ign} is already on the Whitelist of the Server.')
-                    else:
-                        if wl == '':
-                            value = f'{ign}'
-                        else:
-                            value = f'{wl}\n{ign}'
-                        params = {'category': 'general', 'key': 'whitelist', 'value': 'value'}
-                        async with sess.post(
-                                f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers/settings',
-                                headers=headers, params=params) as response:
-                            if response.status != 200:
-                                return await ctx.send(
-                                    f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {res.status})```')
-                            else:
-                                return await ctx.send(f'Added {ign} to the Whitelist of the Server.')
-
-    @whitelist.command(name='remove', description='Removes a User from the Whitelist of the Server.', usage='<User>')
+                        f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {e.status})```')
+                return await ctx.send(f'Added {", ".join(added)} to the Whitelist of the Server.')
+
+    @whitelist.command(name='remove', description='Removes one or more Users (one per line) from the Whitelist of the Server.', usage='<User> [User...]')
     async def remove(self, ctx: commands.Context, *, ign: str) -> discord.Message:
-        async with ClientSession() as sess:
-            headers = {'Authorization': f'Bearer {self.bot.nitrado_token}'}
-            async with sess.get(f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers',
-                                headers=headers) as res:
-                if res.status != 200:
+        names = ign.splitlines()
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            removed = players.difference_update(names)
+            if not removed:
+                return await ctx.send(f'{", ".join(names)} is not on the Whitelist of the Server.')
+            else:
+                try:
+                    await self.players.save(players)
+                except NitradoError as e:
                     return await ctx.send(
-                        f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {res.status})```')
-                else:
-                    json = await res.json()
-                    wl = json['data']['gameserver']['settings']['general']['whitelist']
-                    if not re.search(f'{ign}', wl):
-                        return await ctx.send(f'{ign} is not on the Whitelist of the Server.')
-                    else:
-                        wl = wl.strip()
-                        wl = re.sub(rf'{ign}', '', wl)
-                        wl = re.sub('\n+', '\r', wl)
-                        wl = re.sub('\n', '\r', wl)
-                        wl = re.sub('\r+', '\r', wl)
-                        wl = re.sub('\r\n+', '\r', wl)
-                        wl = re.sub('\n\n+', '\r', wl)
-                        wl = re.sub('\r\r+', '\r', wl)
-                        wl = re.sub('\n', '\r', wl)
-                        wl = wl.strip()
-
-                        value = f'{wl}'
-
-                        params = {'category': 'general', 'key': 'whitelist', 'value': value}
-                        async with sess.post(
-                                f'https://api.nitrado.net/services/{self.bot.service_id}/gameservers/settings',
-                                headers=headers, params=params) as resp:
-                            if resp.status != 200:
-                                return await ctx.send(
-                                    f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {resp.status})```')
-                            else:
-                                return await ctx.send(
-                                    f'Removed {ign} from the Whitelist of the Server.')
+                        f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {e.status})```')
+                return await ctx.send(
+                    f'Removed {", ".join(removed)} from the Whitelist of the Server.')
+
+    @whitelist.command(name='import', description='Adds the Users of an attached file or of the following lines to the Whitelist of the Server.', usage='[User per line]')
+    async def import_users(self, ctx: commands.Context, *, ign: str = None) -> discord.Message:
+        names = await read_names(ctx.message, ign)
+        if not names:
+            return await ctx.send('```\nNo Users given. Attach a file or list them one per line.```')
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            added = players.update(names)
+            if not added:
+                return await ctx.send(f'All {len(names)} Users are already on the Whitelist of the Server.')
+            try:
+                await self.players.save(players)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {e.status})```')
+        return await ctx.send(f'Added {len(added)} of {len(names)} Users to the Whitelist of the Server.')
+
+    @whitelist.command(name='sync', description='Makes the Whitelist of the Server match an attached file, the following lines or the local whitelist file.', usage='[User per line]')
+    async def sync(self, ctx: commands.Context, *, ign: str = None) -> discord.Message:
+        names = await read_names(ctx.message, ign)
+        if not names and os.path.exists(SOURCE_FILE):
+            with open(SOURCE_FILE, encoding='utf-8-sig') as f:
+                names = [line.strip() for line in f if line.strip()]
+        if not names:
+            # Never taken as a request to empty the list
+            return await ctx.send(f'```\nNo Users given. Attach a file, list them one per line or fill {SOURCE_FILE}.```')
+        target = PlayerList(names)
+        async with self.players.lock:
+            try:
+                players = await self.players.load(refresh=True)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error. Failed to request Information from the Server. (Response Status Code: {e.status})```')
+            removed = players.difference_update([userName for userName in players if userName not in target])
+            added = players.update(target)
+            if not added and not removed:
+                return await ctx.send(f'The Whitelist of the Server is already in sync.')
+            try:
+                await self.players.save(players)
+            except NitradoError as e:
+                return await ctx.send(
+                    f'```\nNitrado API Error while trying to Update the Whitelist. (Status Code: {e.status})```')
+        return await ctx.send(f'Synced the Whitelist of the Server: {len(added)} added, {len(removed)} removed.')
 
 
 def setup(bot) -> None:
@@ -22,24 +22,59 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from discord.ext import commands, tasks
 from config import Config
 from os import path
+from utils import adm, backlog
+from utils.changes import ChangeTracker, data_fingerprint, file_fingerprint
+from utils.checkpoint import CheckpointStore
+from utils.nitrado import NitradoError, stream_to_file, write_file
+from utils.outbox import Outbox
+from utils.pipeline import Pipeline, Stage
+from utils.schedule import AdaptiveSchedule, STOPPED
+from utils.seen import SeenLines
+from utils.tail import LogTail, remote_size
 
-import aiohttp
 import aiofiles
 import asyncio
 import logging
 import random
+import time
 import discord
-import re
+
+# Events that are posted to the killfeed channel
+FEED_KINDS = frozenset((adm.SUICIDE, adm.EXPLOSION, adm.PVP, adm.BLED_OUT, adm.WOLF, adm.BEAR, adm.FALL))
 
 class Killfeed(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.reported = {}
         self.last_log = {}
-        self.headers = {'Authorization': f'Bearer {Config.NITRADO_TOKEN}'}
+        self.tails = {}
+        self.checkpoints = CheckpointStore(path.abspath(path.join(path.dirname(__file__), "..", "files", "checkpoints")))
+        self.fetch_latency = {}
+        self.new_lines = {}
+        self.polling = set()
+        self.schedule = AdaptiveSchedule(
+            Config.POLL_INTERVAL,
+            Config.POLL_INTERVAL_MIN,
+            Config.POLL_INTERVAL_MAX,
+            busy_lines=Config.POLL_BUSY_LINES,
+            jitter=Config.POLL_JITTER,
+        )
+        self.changes = ChangeTracker(probe=Config.PROBE_LOG_SIZE)
+        self.buffers = {}
+        self.copies = {}
+        self.executor = None
+        self.outbox = Outbox(bot, Config.OUTBOX_QUEUE_SIZE)
+        # fetch -> parse -> enrich -> publish, publishing waits while a channel's outbox is full, which holds back the rest
+        self.pipeline = Pipeline(
+            Stage("fetch", self.fetch, workers=Config.FETCH_CONCURRENCY, maxsize=len(Config.SERVERS)),
+            Stage("parse", self.check_log, workers=Config.PARSE_WORKERS, maxsize=Config.PIPELINE_QUEUE_SIZE),
+            Stage("enrich", self.enrich, workers=Config.ENRICH_WORKERS, maxsize=Config.PIPELINE_QUEUE_SIZE),
+            Stage("publish", self.publish, workers=Config.PUBLISH_WORKERS, maxsize=Config.PIPELINE_QUEUE_SIZE),
+        )
         logging.basicConfig(level=logging.INFO)
     
     @commands.Cog.listener()
@@ -47,19 +82,70 @@ class Killfeed(commands.Cog):
         logging.info("Started bot | Made by vic#1337 (https://killfeed.me)")
         self.fetch_logs.start()
 
+    def cog_unload(self):
+        self.fetch_logs.cancel()
+        self.pipeline.close()
+        self.outbox.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
     async def run_loop(self):
-        coros = []
-        servers = list(Config.SERVERS.keys())
+        # Each due server is put in on its own, a slow one doesn't hold back the polls of the others
+        for nitrado_id in self.schedule.due(Config.SERVERS.keys()):
+            if nitrado_id not in self.polling:
+                self.polling.add(nitrado_id)
+                await self.pipeline.put(nitrado_id)
 
-        for nitrado_id in servers:
-            log = await self.download_logfile(nitrado_id)
+    def poll_done(self, nitrado_id: int):
+        # The server's new lines were read (or there were none), its events may still be on their way to Discord
+        reschedule = asyncio.ensure_future(self.reschedule(nitrado_id))
+        reschedule.add_done_callback(lambda _: self.polling.discard(nitrado_id))
 
-            if log:
-                coros.append(self.check_log(nitrado_id))
-        
-        await asyncio.gather(*coros)
+    async def reschedule(self, nitrado_id: int):
+        new_lines = self.new_lines.get(nitrado_id, 0)
+        players = None
+        running = True
+        try:
+            if new_lines:
+                # Clearly running, the player count last seen is good enough and costs no request
+                gameserver = self.bot.nitrado.cached_gameserver(nitrado_id)
+            else:
+                # About to back off, asked (at most once per GAMESERVER_CACHE_TTL) whether it's stopped or has players
+                gameserver = await self.bot.nitrado.gameserver(nitrado_id)
+            if gameserver is not None:
+                running = gameserver.get("status") not in STOPPED
+                players = (gameserver.get("query") or {}).get("player_current")
+        except Exception as e:
+            # Planned from the log alone then
+            logging.warning(f"Failed to get gameserver status for {nitrado_id}: {type(e).__name__}: {e}")
+
+        delay = self.schedule.plan(nitrado_id, new_lines=new_lines, players=players, running=running)
+        logging.info(f"Next poll for {nitrado_id} in {delay:.0f}s ({new_lines} new lines, {players} players)")
+
+    async def fetch(self, nitrado_id: int):
+        # Passes the server on to be parsed only if there is something new to read
+        self.new_lines[nitrado_id] = 0
+        log = await self.fetch_logfile(nitrado_id)
+        if not log:
+            self.poll_done(nitrado_id)
+            return None
+        return nitrado_id
+
+    async def fetch_logfile(self, nitrado_id: int):
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(self.download_logfile(nitrado_id), timeout=Config.FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.error(f"Timed out downloading logfile for {nitrado_id} after {Config.FETCH_TIMEOUT}s")
+        except Exception as e:
+            logging.exception(f"Failed to download logfile for {nitrado_id}: {type(e).__name__}: {e}")
+        finally:
+            self.fetch_latency[nitrado_id] = time.monotonic() - started
+            logging.info(f"Fetch for {nitrado_id} took {self.fetch_latency[nitrado_id]:.2f}s")
+        return False
     
-    @tasks.loop(minutes=3)
+    # Only checks which servers are due, how often each one is polled is up to self.schedule
+    @tasks.loop(seconds=Config.POLL_TICK)
     async def fetch_logs(self):
         await self.run_loop()
     
@@ -70,144 +156,299 @@ class Killfeed(commands.Cog):
 
         if channel is None:
             logging.error(f"Failed to get channel of channel ID: {Config.SERVERS[nitrado_id]}")
+            self.poll_done(nitrado_id)
             return
         
         if nitrado_id not in self.reported:
-            self.reported[nitrado_id] = []
+            self.reported[nitrado_id] = SeenLines()
             
         if nitrado_id not in self.last_log:
             self.last_log[nitrado_id] = ""
 
-        async with aiofiles.open(fp, mode="r") as f:
-            async for line in f:
-                if str(line) in self.reported[nitrado_id]:
-                    continue
-                
-                if "AdminLog" in line:
-                    if self.last_log[nitrado_id] != str(line):
-                        self.last_log[nitrado_id] = str(line)
-                        self.reported[nitrado_id] = []
-
-                self.reported[nitrado_id].append(str(line))
-
-                if "(DEAD)" in line or "committed suicide" in line:
-                    timestamp = str(re.search('(\\d+:\\d+:\\d+)', line).group(1))
-                    player_killed = str(re.search(r'[\'"](.*?)[\'"]', line).group(1))
-
-                    if "committed suicide" in line:
-                        embed = discord.Embed(
-                            title=f"💀 Suicide | {timestamp}",
-                            description=f"**{player_killed}** commited suicide",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "hit by explosion" in line:
-                        explosion = str(re.search(r'\[HP: 0\] hit by explosion \((.*)\)', line).group(1))
-                        embed = discord.Embed(
-                            title=f"💀 Exploded | {timestamp}",
-                            description=f"**{player_killed}** died from explosion ({explosion})",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "killed by Player" in line:
-                        player_killer = str(re.search(r'killed by Player "(.*?)"', line).group(1))
-                        coords = str(re.search(r'pos=<(.*?)>', line).group(1))
-                        weapon = re.search(r' with (.*) from', line) or re.search(r'with (.*)', line)
-                        weapon = str(weapon.group(1))
-                        
-                        try:
-                            distance = round(float(re.search(r'from ([0-9.]+) meters', line).group(1)), 2)
-                        except AttributeError:
-                            distance = 0.0
-
-                        embed = discord.Embed(
-                            title=f"💀 PvP Kill | {timestamp}",
-                            description=f"**{player_killer}** killed **{player_killed}**\n**Weapon**: `{weapon}` ({distance}m)\n**Location**: {coords}",
-                            color=0xFF0000
-                        ).set_thumbnail(url=Config.EMBED_IMAGE)
-                        rand_num = random.randint(1, 70)
-                        if rand_num <= 2:
-                            embed.description += "\n\nИіаlΊа | Ωmerta RP▪PvP Feed"
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "bled out" in line:
-                        embed = discord.Embed(
-                            title=f"🩸 Bled Out | {timestamp}",
-                            description=f"**{player_killed}** bled out",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "Animal_CanisLupus_Grey" in line or "Animal_CanisLupus_White" in line:
-                        embed = discord.Embed(
-                            title=f"🐺 Wolf Kill | {timestamp}",
-                            description=f"**{player_killed}** killed by Wolf!",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "Animal_UrsusArctos" in line or "Brown Bear" in line:
-                        embed = discord.Embed(
-                            title=f"🐻 Bear Kill | {timestamp}",
-                            description=f"**{player_killed}** killed by Bear!",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-                    elif "hit by FallDamage" in line:
-                        embed = discord.Embed(
-                            title=f"💀 Fall Death | {timestamp}",
-                            description=f"**{player_killed}** fell to their death!",
-                            color=0xFF0000
-                        )
-                        await channel.send(embed=embed)
-                        await asyncio.sleep(2) # Avoid rate limits
-            logging.info(f"Finished checking logfile for {nitrado_id}")
-    
+        tail = self.tail(nitrado_id)
+        lines = tail.lines
+
+        try:
+            data = self.buffers.pop(nitrado_id, None)
+            if data is None and Config.PROCESS_PARSE and path.getsize(fp) - tail.start >= Config.PROCESS_PARSE_THRESHOLD:
+                async with aiofiles.open(fp, mode="rb") as f:
+                    data = await f.read()
+
+            if data is not None:
+                if tail.start and not tail.matches(memoryview(data)[tail.overlap():tail.start]):
+                    # Full download of a new session, nothing in it has been read yet
+                    tail.reset()
+
+                if Config.PROCESS_PARSE and len(data) - tail.start >= Config.PROCESS_PARSE_THRESHOLD:
+                    async for event in self.parse_backlog(nitrado_id, tail, data):
+                        yield channel, event
+                    return
+
+                for raw in self.split_lines(data, tail.start):
+                    tail.advance(raw)
+                    event = self.classify(nitrado_id, tail, raw)
+                    if event is not None:
+                        yield channel, event
+            else:
+                async with aiofiles.open(fp, mode="rb") as f:
+                    if tail.start:
+                        # Only the bytes read last are checked, not everything before them
+                        await f.seek(tail.overlap())
+                        if not tail.matches(await f.read(tail.start - tail.overlap())):
+                            # Full download of a new session, nothing in it has been read yet
+                            tail.reset()
+                    await f.seek(tail.start)
+
+                    async for raw in f:
+                        if not raw.endswith(b"\n"):
+                            break # Still being written, picked up on the next poll
+                        tail.advance(raw)
+                        event = self.classify(nitrado_id, tail, raw)
+                        if event is not None:
+                            yield channel, event
+        finally:
+            # A restart carries on from here instead of posting the whole session again
+            self.checkpoints.save(nitrado_id, tail)
+            self.new_lines[nitrado_id] = tail.lines - lines if tail.lines >= lines else tail.lines
+            self.poll_done(nitrado_id)
+        logging.info(f"Finished checking logfile for {nitrado_id} ({tail.lines} lines read, queued: {self.pipeline.depths()}, {self.outbox.pending()} embeds)")
+
+    def tail(self, nitrado_id: int) -> LogTail:
+        if nitrado_id not in self.tails:
+            self.tails[nitrado_id] = self.checkpoints.load(nitrado_id)
+        return self.tails[nitrado_id]
+
+    def classify(self, nitrado_id: int, tail: LogTail, raw: bytes):
+        # Returns the line's event if it's new and goes to the feed
+        if not self.reported[nitrado_id].add(raw):
+            return None
+
+        return self.feed_event(nitrado_id, tail, raw, adm.parse_line(raw.decode("utf-8", errors="replace")))
+
+    async def parse_backlog(self, nitrado_id: int, tail: LogTail, data: bytes):
+        # Chunks are parsed in worker processes, the results are still walked through in log order
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=Config.PROCESS_PARSE_WORKERS)
+        loop = asyncio.get_event_loop()
+        chunks = backlog.split(data, tail.start, Config.PROCESS_PARSE_CHUNK_SIZE)
+        logging.info(f"Parsing {len(data) - tail.start} bytes of logfile for {nitrado_id} in {len(chunks)} chunks")
+        futures = [
+            loop.run_in_executor(self.executor, backlog.parse_chunk, data[begin:end], FEED_KINDS)
+            for begin, end in chunks
+        ]
+
+        for (begin, end), future in zip(chunks, futures):
+            lines = await future
+            position = begin
+            for length, key, event in lines:
+                # Only lines the workers found an event in are copied out of the buffer
+                if self.reported[nitrado_id].add_key(key) and event is not None:
+                    event = self.feed_event(nitrado_id, tail, data[position:position + length], event)
+                    if event is not None:
+                        yield event
+                position += length
+            tail.advance(memoryview(data)[begin:end], len(lines))
+
+    def feed_event(self, nitrado_id: int, tail: LogTail, raw: bytes, event):
+        if event is None:
+            return None
+
+        if event.kind == adm.HEADER:
+            line = raw.decode("utf-8", errors="replace")
+            tail.header = raw.strip()
+            if self.last_log[nitrado_id] != str(line):
+                self.last_log[nitrado_id] = str(line)
+                self.reported[nitrado_id].clear()
+                self.reported[nitrado_id].add(raw)
+            return None
+        return event if event.kind in FEED_KINDS else None
+
+    async def enrich(self, item):
+        channel, event = item
+        if event.kind == adm.SUICIDE:
+            embed = discord.Embed(
+                title=f"💀 Suicide | {event.time}",
+                description=f"**{event.player}** commited suicide",
+                color=0xFF0000
+            )
+        elif event.kind == adm.EXPLOSION:
+            embed = discord.Embed(
+                title=f"💀 Exploded | {event.time}",
+                description=f"**{event.player}** died from explosion ({event.item})",
+                color=0xFF0000
+            )
+        elif event.kind == adm.PVP:
+            embed = discord.Embed(
+                title=f"💀 PvP Kill | {event.time}",
+                description=f"**{event.killer}** killed **{event.player}**\n**Weapon**: `{event.weapon}` ({event.distance}m)\n**Location**: {event.coords}",
+                color=0xFF0000
+            ).set_thumbnail(url=Config.EMBED_IMAGE)
+            rand_num = random.randint(1, 70)
+            if rand_num <= 2:
+                embed.description += "\n\nИіаlΊа | Ωmerta RP▪PvP Feed"
+        elif event.kind == adm.BLED_OUT:
+            embed = discord.Embed(
+                title=f"🩸 Bled Out | {event.time}",
+                description=f"**{event.player}** bled out",
+                color=0xFF0000
+            )
+        elif event.kind == adm.WOLF:
+            embed = discord.Embed(
+                title=f"🐺 Wolf Kill | {event.time}",
+                description=f"**{event.player}** killed by Wolf!",
+                color=0xFF0000
+            )
+        elif event.kind == adm.BEAR:
+            embed = discord.Embed(
+                title=f"🐻 Bear Kill | {event.time}",
+                description=f"**{event.player}** killed by Bear!",
+                color=0xFF0000
+            )
+        elif event.kind == adm.FALL:
+            embed = discord.Embed(
+                title=f"💀 Fall Death | {event.time}",
+                description=f"**{event.player}** fell to their death!",
+                color=0xFF0000
+            )
+        else:
+            return None
+        return channel, embed
+
+    async def publish(self, item):
+        channel, embed = item
+        await self.outbox.send(channel, embed)
+
+    @staticmethod
+    def split_lines(data: bytes, start: int = 0):
+        # Walks the buffer with find() instead of splitlines(), so no list of every line is built
+        end = data.find(b"\n", start)
+        while end != -1:
+            yield data[start:end + 1]
+            start = end + 1
+            end = data.find(b"\n", start)
+        # Anything after the last newline is still being written, picked up on the next poll
+
     async def download_logfile(self, nitrado_id):
         logging.info(f"Downloading logfile for {nitrado_id}")
 
-        async with aiohttp.ClientSession() as ses:
-            async with ses.get(f'https://api.nitrado.net/services/{nitrado_id}/gameservers', headers=self.headers) as r:
-                if r.status != 200:
-                    logging.error(f"Failed to get gameserver information ({nitrado_id}) ({r.status})")
-                    return False
-                else:
-                    json = await r.json()
-                    
-                    username = json['data']['gameserver']['username']
-                    game = json["data"]["gameserver"]["game"].lower()
-
-                    if game == "dayzps":
-                        logpath = "dayzps/config/DayZServer_PS4_x64.ADM"
-                    elif game == "dayzxb":
-                        logpath = "dayzxb/config/DayZServer_X1_x64.ADM"
-                    else:
-                        log_path = ""
-                        logging.error("This bot only supports: DayZ PS4 and DayZ Xbox")
+        try:
+            logpath = await self.bot.nitrado.log_path(nitrado_id)
+        except NitradoError as e:
+            logging.error(f"Failed to get gameserver information ({nitrado_id}) ({e.status})")
+            return False
+
+        if logpath is None:
+            logging.error("This bot only supports: DayZ PS4 and DayZ Xbox")
+            return False
+
+        tail = self.tail(nitrado_id)
+        size = None
+        if self.changes.probe:
+            try:
+                size = await self.bot.nitrado.file_size(nitrado_id, logpath)
+            except NitradoError as e:
+                if 400 <= e.status < 500:
+                    logging.warning(f"Logfile size probe isn't supported ({e.status}), downloading without it from now on")
+                    self.changes.probe = False
+            # Only skipped once something was read from this log, a fresh tail always needs a download
+            if size is not None and tail.offset and self.changes.unchanged_size(nitrado_id, size):
+                logging.info(f"Logfile for ({nitrado_id}) didn't change ({size} bytes), skipping download")
+                return False
+
+        downloaded = await self.download_range(nitrado_id, logpath, tail, size)
+        if downloaded is None:
+            # A new session, read from its start right away instead of waiting for the next poll
+            tail.reset()
+            self.changes.forget(nitrado_id)
+            downloaded = await self.download_range(nitrado_id, logpath, tail, size)
+        return bool(downloaded)
+
+    async def download_range(self, nitrado_id, logpath: str, tail: LogTail, size: int):
+        # True if there is something to read, None if the log was rotated and has to be downloaded from the start
+        async with self.bot.nitrado.get(f'/services/{nitrado_id}/gameservers/file_server/download?file={logpath}') as resp:
+            if resp.status != 200:
+                logging.error(f"Failed to get nitrado download URL! ({nitrado_id}) ({resp.status})")
+                # Resolved again on the next poll, in case the server's username or game changed
+                self.bot.nitrado.forget_log_path(nitrado_id)
+                return False
+            else:
+                json = await resp.json()
+                url = json["data"]["token"]["url"]
+
+                # Without tailing the whole file is downloaded, but only the lines after the checkpoint are read
+                headers = tail.range_headers() if Config.TAIL_LOGS else {}
+                if tail.offset:
+                    headers.update(self.changes.conditional_headers(nitrado_id))
+
+                async with self.bot.nitrado.get(url, auth=True, headers=headers) as res:
+                    if res.status == 304:
+                        logging.info(f"Logfile for ({nitrado_id}) wasn't modified since the last poll")
                         return False
-                    
-                    async with ses.get(f'https://api.nitrado.net/services/{nitrado_id}/gameservers/file_server/download?file=/games/{username}/noftp/{logpath}', headers=self.headers) as resp:
-                        if resp.status != 200:
-                            logging.error(f"Failed to get nitrado download URL! ({nitrado_id}) ({resp.status})")
-                            return False
+                    elif res.status == 416:
+                        # Nothing new since the last poll, unless the server started a fresh (shorter) log
+                        if 0 <= remote_size(res.headers.get("Content-Range")) < tail.offset:
+                            logging.info(f"Logfile for ({nitrado_id}) was rotated, starting over")
+                            return None
+                        return False
+                    elif res.status not in (200, 206):
+                        logging.error(f'Failed to download nitrado log file! ({nitrado_id}) ({res.status})')
+                        self.bot.nitrado.forget_log_path(nitrado_id)
+                        return False
+                    elif not tail.accept(res.status, res.headers.get("Content-Range")):
+                        logging.warning(f"Unexpected partial logfile for ({nitrado_id}), starting over")
+                        return None
+                    else:
+                        fp = path.abspath(path.join(path.dirname(__file__), "..", "files", f'{nitrado_id}.ADM'))
+                        if Config.PARSE_IN_MEMORY:
+                            data = self.buffers[nitrado_id] = await res.read()
+                            if res.status == 200:
+                                # A ranged download only holds the end of the log, the copy stays the last whole one
+                                self.save_copy(nitrado_id, fp, data)
+                                digest = data_fingerprint(data)
                         else:
-                            json = await resp.json()
-                            url = json["data"]["token"]["url"]
-
-                            async with ses.get(url, headers=self.headers) as res:
-                                if res.status != 200:
-                                    logging.error(f'Failed to download nitrado log file! ({nitrado_id}) ({res.status})')
-                                    return False
-                                else:
-                                    fp = path.abspath(path.join(path.dirname(__file__), "..", "files", f'{nitrado_id}.ADM'))
-                                    async with aiofiles.open(fp, mode="wb+") as f:
-                                        await f.write(await res.read())
-                                        await f.close()
-                                    logging.info(f"Successfully downloaded logfile for ({nitrado_id})")
-                                    return True
+                            length = await stream_to_file(res, fp, Config.DOWNLOAD_CHUNK_SIZE)
+                            if res.status == 200:
+                                digest = await file_fingerprint(fp, length)
+                        self.changes.downloaded(nitrado_id, res.headers, size)
+                        logging.info(f"Successfully downloaded logfile for ({nitrado_id})")
+
+                        if res.status == 206:
+                            # The range starts a little before the offset, those bytes have to be the ones read last
+                            if Config.PARSE_IN_MEMORY:
+                                prefix = data[tail.overlap():tail.start]
+                            else:
+                                async with aiofiles.open(fp, mode="rb") as f:
+                                    await f.seek(tail.overlap())
+                                    prefix = await f.read(tail.start - tail.overlap())
+                            if not tail.matches(prefix):
+                                logging.warning(f"Logfile for ({nitrado_id}) doesn't continue where the last poll stopped, it was rotated, starting over")
+                                self.buffers.pop(nitrado_id, None)
+                                return None
+
+                        # Servers that ignore the validators still send the whole file, compare its ends with the last one
+                        if res.status == 200 and self.changes.unchanged_fingerprint(nitrado_id, digest) and tail.offset:
+                            logging.info(f"Logfile for ({nitrado_id}) is the same as on the last poll, skipping it")
+                            self.buffers.pop(nitrado_id, None)
+                            return False
+                        return True
+
+    def save_copy(self, nitrado_id: int, fp: str, data: bytes):
+        # The copy on disk is only kept for reference, parsing doesn't wait for it
+        copy = asyncio.ensure_future(self.write_copy(self.copies.get(nitrado_id), fp, data))
+        self.copies[nitrado_id] = copy
+        copy.add_done_callback(lambda copy: self.copy_done(nitrado_id, copy))
+
+    async def write_copy(self, previous, fp: str, data: bytes):
+        # A server's copies go through the same .part file, one at a time and in the order they were downloaded
+        if previous is not None:
+            await asyncio.wait([previous])
+        await write_file(fp, data)
+
+    def copy_done(self, nitrado_id: int, copy):
+        if self.copies.get(nitrado_id) is copy:
+            del self.copies[nitrado_id]
+        if not copy.cancelled() and copy.exception() is not None:
+            logging.error(f"Failed to save logfile copy: {copy.exception()}")
 
 def setup(bot):
     bot.add_cog(Killfeed(bot))
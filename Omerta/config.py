@@ -7,6 +7,52 @@ class Config:
     BOT_PREFIX = ""
     # PVP Kill Embed Image supports .png .jpg .gif
     EMBED_IMAGE = "https://i.postimg.cc/KvZR79Tt/candle.gif"
+    # Only download the part of the logfile that was added since the last poll
+    TAIL_LOGS = True
+    # How many servers may download their logfile at the same time
+    FETCH_CONCURRENCY = 4
+    # Seconds before a server's logfile download is given up (retried on the next poll)
+    FETCH_TIMEOUT = 60
+
+    # Connection pool shared by all Nitrado API requests
+    HTTP_POOL_LIMIT = 100
+    HTTP_POOL_LIMIT_PER_HOST = 10
+    # Seconds a resolved DNS entry is reused
+    HTTP_DNS_CACHE_TTL = 300
+    # Seconds gameserver details (GET /services/{id}/gameservers) are reused before asking Nitrado again
+    GAMESERVER_CACHE_TTL = 60
+    # Bytes of the logfile download held in memory at a time
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    # Ask Nitrado for the logfile's size first and skip the download if it didn't change (turned off by itself if unsupported)
+    PROBE_LOG_SIZE = True
+    # Parse the downloaded logfile straight from memory, the last full download is copied to files/ in the background
+    PARSE_IN_MEMORY = False
+    # Events that may wait between two steps of the killfeed before the earlier step waits too
+    PIPELINE_QUEUE_SIZE = 1000
+    # Tasks per killfeed step, events of a server only stay in order with one parse, enrich and publish worker
+    PARSE_WORKERS = 1
+    ENRICH_WORKERS = 1
+    PUBLISH_WORKERS = 1
+    # Embeds waiting to be posted per channel before the killfeed waits for Discord
+    OUTBOX_QUEUE_SIZE = 100
+    # Parse big backlogs (e.g. after downtime) in worker processes, so the bot stays responsive meanwhile
+    PROCESS_PARSE = False
+    # Bytes left to read before the workers are used, and how the backlog is split up between them
+    PROCESS_PARSE_THRESHOLD = 8 * 1024 * 1024
+    PROCESS_PARSE_CHUNK_SIZE = 1024 * 1024
+    PROCESS_PARSE_WORKERS = 2
+
+    # Seconds between polls of a server with some activity, busy ones are polled down to POLL_INTERVAL_MIN
+    # and idle or stopped ones back off up to POLL_INTERVAL_MAX
+    POLL_INTERVAL = 180
+    POLL_INTERVAL_MIN = 60
+    POLL_INTERVAL_MAX = 900
+    # New lines in a single poll that make a server count as busy
+    POLL_BUSY_LINES = 500
+    # Fraction every interval is randomly moved by, so servers don't all poll at once
+    POLL_JITTER = 0.1
+    # Seconds between checks for servers that are due
+    POLL_TICK = 10
 
     # Recommended to have less than 5 (Enable "Developer Mode" to get your channel's ID)
     SERVERS = {
@@ -24,6 +24,8 @@ SOFTWARE.
 
 from discord.ext import commands
 from config import Config
+from utils.nitrado import NitradoClient
+from os import path
 
 import logging
 import asyncio
@@ -38,6 +40,16 @@ def main():
         description="Nialta | Omerta RP"
     )
 
+    # Shared Nitrado API client, used by every cog
+    bot.nitrado = NitradoClient(
+        Config.NITRADO_TOKEN,
+        limit=Config.HTTP_POOL_LIMIT,
+        limit_per_host=Config.HTTP_POOL_LIMIT_PER_HOST,
+        dns_ttl=Config.HTTP_DNS_CACHE_TTL,
+        gameserver_ttl=Config.GAMESERVER_CACHE_TTL,
+        log_paths_file=path.join(path.dirname(path.abspath(__file__)), "files", "log_paths.json")
+    )
+
     # Killfeed cog
     cogs = [
         'cogs.killfeed',
@@ -53,12 +65,14 @@ def main():
             logging.exception('Failed to load cog {}\n{}: {}'.format(extension, type(e).__name__, e))
 
     # Start bot loop
+    loop = asyncio.get_event_loop()
     try:
-        loop = asyncio.get_event_loop()
         loop.create_task(bot.start(Config.DISCORD_TOKEN))
         loop.run_forever()
     except KeyboardInterrupt:
         pass
+    finally:
+        loop.run_until_complete(bot.nitrado.close())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The bot runs from this directory, which is where ``utils`` is imported from
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,25 @@
+import pytest
+
+# utils.playerlist talks to Nitrado through utils.nitrado
+pytest.importorskip("aiohttp")
+pytest.importorskip("aiofiles")
+
+from utils.playerlist import PlayerList
+
+
+def test_names_match_case_insensitively():
+    players = PlayerList.parse("SurvivorOne\n  Bandit42 \n")
+
+    assert "survivorone" in players
+    assert "BANDIT42" in players
+    assert players.add("SURVIVORONE") is False
+    assert players.update(["bandit42", "NewGuy"]) == ["NewGuy"]
+    # The first spelling is the one that's kept
+    assert players.serialize() == "SurvivorOne\nBandit42\nNewGuy"
+
+
+def test_remove_ignores_case():
+    players = PlayerList(["MixedCase", "Other"])
+
+    assert players.difference_update(["mixedcase", "missing"]) == ["mixedcase"]
+    assert list(players) == ["Other"]
@@ -0,0 +1,37 @@
+from utils.stats import StatBatch
+
+
+def test_kill_updates_both_streaks():
+    batch = StatBatch()
+    batch.kill("killer", "victim", 120.5, "M4-A1")
+
+    killer = batch.stats["killer"]
+    assert killer.kills == 1
+    assert not killer.reset_killstreak
+    assert killer.killstreak == 1
+    assert killer.reset_deathstreak
+    assert killer.deathstreak == 0
+
+    victim = batch.stats["victim"]
+    assert victim.pvp_deaths == 1
+    assert victim.reset_killstreak
+    assert victim.killstreak == 0
+    assert not victim.reset_deathstreak
+    assert victim.deathstreak == 1
+
+
+def test_streaks_add_up_after_a_reset():
+    batch = StatBatch()
+    batch.kill("a", "b", 10.0, "KA-M")
+    batch.kill("a", "c", 20.0, "KA-M")
+    batch.kill("b", "a", 5.0, "Mosin")
+
+    a = batch.stats["a"]
+    assert a.kills == 2
+    assert a.reset_killstreak and a.killstreak == 0
+    assert a.reset_deathstreak and a.deathstreak == 1
+    assert a.longest_kill_distance == 20.0
+
+    b = batch.stats["b"]
+    assert b.reset_killstreak and b.killstreak == 1
+    assert b.reset_deathstreak and b.deathstreak == 0
@@ -0,0 +1,172 @@
+import re
+
+HEADER = "header"
+CONNECT = "connect"
+DISCONNECT = "disconnect"
+POSITION = "position"
+PLACED = "placed"
+BUILT = "built"
+DISMANTLED = "dismantled"
+HIT = "hit"
+UNCONSCIOUS = "unconscious"
+CONSCIOUS = "conscious"
+SUICIDE = "suicide"
+EXPLOSION = "explosion"
+PVP = "pvp"
+BLED_OUT = "bled_out"
+WOLF = "wolf"
+BEAR = "bear"
+FALL = "fall"
+ZOMBIE = "zombie"
+DIED = "died"
+DEAD = "dead"
+
+DEATHS = frozenset((SUICIDE, EXPLOSION, PVP, BLED_OUT, WOLF, BEAR, FALL, ZOMBIE, DIED, DEAD))
+
+_TIME = re.compile(r"(\d+:\d+:\d+)")
+_CONNECTED = re.compile(r'Player "(.*?)" is connected \(id=([^\s)]*)')
+_DISCONNECTED = re.compile(r'Player "(.*?)"\s*\(id=([^\s)]*)\) has been disconnected')
+_PLAYER = re.compile(r'Player "(.*?)"(?: \(DEAD\))?\s*\(id=([^\s)]*)(?: pos=<([^>]*)>)?\)(.*)')
+_KILLER = re.compile(r'killed by Player "(.*?)"\s*\(id=([^\s)]*)')
+_WEAPON = re.compile(r" with (.*) from")
+_WEAPON_MELEE = re.compile(r"with (.*)")
+_DISTANCE = re.compile(r"from ([0-9.]+) meters")
+_EXPLOSION = re.compile(r"hit by explosion \((.*)\)")
+_PLACED = re.compile(r"placed (.*)")
+_BUILT = re.compile(r"built (.*?) with (.*)")
+_DISMANTLED = re.compile(r"dismantled (.*?) with (.*)")
+_HIT = re.compile(r"into (.*?) for (.*?) damage")
+
+
+class Event:
+    """
+        A classified ADM log line.
+
+    ``player`` is the player the line is about (the victim for deaths and
+    hits), ``killer`` is only set for PvP kills. ``item`` holds the placed
+    item, the built/dismantled part, the explosion type or the body part
+    that was hit. ``pos`` is the ``(x, z, y)`` tuple from ``pos=<...>`` and
+    ``coords`` the text it was parsed from, as the log wrote it.
+    """
+
+    __slots__ = ("kind", "time", "player", "player_id", "killer", "killer_id",
+                 "pos", "coords", "weapon", "distance", "item", "damage")
+
+    def __init__(self, kind: str, time: str = None, player: str = None, player_id: str = None) -> None:
+        self.kind = kind
+        self.time = time
+        self.player = player
+        self.player_id = player_id
+        self.killer = None
+        self.killer_id = None
+        self.pos = None
+        self.coords = None
+        self.weapon = None
+        self.distance = 0.0
+        self.item = None
+        self.damage = None
+
+    def __repr__(self) -> str:
+        return f"<Event {self.kind} {self.time} {self.player!r}>"
+
+
+def _weapon(text: str):
+    match = _WEAPON.search(text) or _WEAPON_MELEE.search(text)
+    return match.group(1) if match else None
+
+
+def _distance(text: str) -> float:
+    match = _DISTANCE.search(text)
+    return round(float(match.group(1)), 2) if match else 0.0
+
+
+def parse_line(line: str):
+    """Classifies a single ADM line, returns None for lines no cog cares about."""
+    line = line.rstrip()
+    if "AdminLog started on" in line:
+        return Event(HEADER)
+
+    start = line.find('Player "')
+    if start == -1 or "PlayerList log" in line:
+        return None
+
+    match = _TIME.search(line)
+    time = match.group(1) if match else None
+
+    if "is connected" in line:
+        match = _CONNECTED.search(line, start)
+        return Event(CONNECT, time, match.group(1), match.group(2)) if match else None
+
+    if "has been disconnected" in line:
+        match = _DISCONNECTED.search(line, start)
+        return Event(DISCONNECT, time, match.group(1), match.group(2)) if match else None
+
+    match = _PLAYER.match(line, start)
+    if match is None:
+        return None
+
+    name, player_id, pos, rest = match.groups()
+    event = Event(POSITION, time, name, player_id)
+    if pos:
+        event.coords = pos
+        try:
+            event.pos = tuple(float(value) for value in pos.split(","))
+        except ValueError:
+            pass
+
+    if "(DEAD)" in line or "committed suicide" in rest:
+        if "committed suicide" in rest:
+            event.kind = SUICIDE
+        elif "hit by explosion" in rest:
+            event.kind = EXPLOSION
+            match = _EXPLOSION.search(rest)
+            event.item = match.group(1) if match else None
+        elif "killed by Player" in rest:
+            event.kind = PVP
+            match = _KILLER.search(rest)
+            if match:
+                event.killer, event.killer_id = match.groups()
+            event.weapon = _weapon(rest)
+            event.distance = _distance(rest)
+        elif "bled out" in rest:
+            event.kind = BLED_OUT
+        elif "Animal_CanisLupus_Grey" in rest or "Animal_CanisLupus_White" in rest:
+            event.kind = WOLF
+        elif "Animal_UrsusArctos" in rest or "Brown Bear" in rest:
+            event.kind = BEAR
+        elif "hit by FallDamage" in rest:
+            event.kind = FALL
+        elif "killed by ZmbM" in rest:
+            event.kind = ZOMBIE
+        elif "died." in rest:
+            event.kind = DIED
+        else:
+            event.kind = DEAD
+    elif "hit by" in rest:
+        event.kind = HIT
+        match = _HIT.search(rest)
+        if match:
+            event.item = match.group(1).split("(")[0]
+            event.damage = match.group(2)
+    elif "is unconscious" in rest:
+        event.kind = UNCONSCIOUS
+    elif "regained consciousness" in rest:
+        event.kind = CONSCIOUS
+    elif "placed" in rest:
+        event.kind = PLACED
+        match = _PLACED.search(rest)
+        event.item = match.group(1) if match else None
+    elif "built" in rest and "with" in rest:
+        event.kind = BUILT
+        match = _BUILT.search(rest)
+        if match:
+            event.item, event.weapon = match.groups()
+    elif "dismantled" in rest and "with" in rest:
+        event.kind = DISMANTLED
+        match = _DISMANTLED.search(rest)
+        if match:
+            event.item, event.weapon = match.groups()
+    elif event.pos is None:
+        return None
+
+    return event
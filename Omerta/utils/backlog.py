@@ -0,0 +1,43 @@
+from utils import adm
+from utils.seen import SeenLines
+
+
+def split(data: bytes, start: int, size: int) -> list:
+    """
+        Cuts ``data[start:]`` into ``(begin, end)`` ranges of about ``size`` bytes.
+
+    Ranges always end after a newline, a trailing line without one (still
+    being written) is left out.
+    """
+    chunks = []
+    stop = data.rfind(b"\n") + 1
+    while start < stop:
+        end = start + size
+        if end >= stop:
+            end = stop
+        else:
+            end = data.find(b"\n", end - 1) + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def parse_chunk(chunk: bytes, kinds: frozenset) -> list:
+    """
+        Parses a block of complete lines, meant to run in a worker process.
+
+    Returns ``(length, key, event)`` for every line, in order. ``key`` is the
+    line's SeenLines hash and ``event`` is only kept for headers and the given
+    kinds (None otherwise), so little has to be sent back to the bot.
+    """
+    results = []
+    position = 0
+    while position < len(chunk):
+        end = chunk.find(b"\n", position) + 1
+        raw = chunk[position:end]
+        event = adm.parse_line(raw.decode("utf-8", errors="replace"))
+        if event is not None and event.kind != adm.HEADER and event.kind not in kinds:
+            event = None
+        results.append((end - position, SeenLines.key(raw), event))
+        position = end
+    return results
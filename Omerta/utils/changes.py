@@ -0,0 +1,71 @@
+from hashlib import blake2b
+
+import aiofiles
+
+# Bytes from the start and the end of a log that make up its fingerprint
+FINGERPRINT_BYTES = 1024
+
+
+def fingerprint(head: bytes, tail: bytes, size: int) -> bytes:
+    digest = blake2b(head, digest_size=16)
+    digest.update(tail)
+    digest.update(size.to_bytes(8, "little"))
+    return digest.digest()
+
+
+def data_fingerprint(data: bytes) -> bytes:
+    return fingerprint(data[:FINGERPRINT_BYTES], data[-FINGERPRINT_BYTES:], len(data))
+
+
+async def file_fingerprint(path: str, size: int) -> bytes:
+    async with aiofiles.open(path, mode="rb") as f:
+        head = await f.read(FINGERPRINT_BYTES)
+        await f.seek(max(0, size - FINGERPRINT_BYTES))
+        tail = await f.read(FINGERPRINT_BYTES)
+    return fingerprint(head, tail, size)
+
+
+class ChangeTracker:
+    """
+        What was known about each service's log at its last download.
+
+    Used in order of cost: the remote file size from a size probe (while
+    ``probe`` is on), the ``ETag``/``Last-Modified`` validators sent back as
+    conditional request headers, and, for full downloads, a fingerprint of
+    the first and last kilobyte compared with the previous one.
+    """
+
+    def __init__(self, probe: bool = True) -> None:
+        self.probe = probe
+        self.sizes = {}
+        self.validators = {}
+        self.fingerprints = {}
+
+    def unchanged_size(self, key, size: int) -> bool:
+        return self.sizes.get(key) == size
+
+    def conditional_headers(self, key) -> dict:
+        etag, modified = self.validators.get(key, (None, None))
+        headers = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if modified is not None:
+            headers["If-Modified-Since"] = modified
+        return headers
+
+    def downloaded(self, key, headers, size: int = None) -> None:
+        """Remembers the validators of a successful download and the size probed before it."""
+        self.validators[key] = (headers.get("ETag"), headers.get("Last-Modified"))
+        if size is not None:
+            self.sizes[key] = size
+
+    def unchanged_fingerprint(self, key, value: bytes) -> bool:
+        """Whether a full download has the same fingerprint as the last one, remembers the new one."""
+        unchanged = self.fingerprints.get(key) == value
+        self.fingerprints[key] = value
+        return unchanged
+
+    def forget(self, key) -> None:
+        self.sizes.pop(key, None)
+        self.validators.pop(key, None)
+        self.fingerprints.pop(key, None)
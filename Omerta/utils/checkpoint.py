@@ -0,0 +1,56 @@
+import json
+import os
+
+from utils.tail import LogTail
+
+
+class CheckpointStore:
+    """
+        Keeps every service's LogTail on disk, so a restart carries on where the last poll stopped.
+
+    A checkpoint is a few fields of JSON per service (session header, offset,
+    line count, rolling CRC and the last bytes read), so loading it doesn't depend on the size of
+    the log. ``save`` goes through a temporary file and ``os.replace``, a crash
+    leaves either the previous checkpoint or the new one, never half of one.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, service_id) -> str:
+        return os.path.join(self.directory, f"{service_id}.checkpoint.json")
+
+    def load(self, service_id) -> LogTail:
+        """Returns the saved tail of the service, or a fresh one if there is none (or it can't be read)."""
+        tail = LogTail()
+        try:
+            with open(self.path(service_id)) as f:
+                data = json.load(f)
+            header = data["header"]
+            tail.header = header.encode("latin-1") if header is not None else None
+            tail.offset = tail.start = int(data["offset"])
+            tail.lines = int(data["lines"])
+            tail.crc = int(data["crc"])
+            # Missing from older checkpoints, the next download is then a full one
+            tail.last = data.get("last", "").encode("latin-1")
+        except (OSError, ValueError, KeyError, TypeError):
+            tail.reset()
+        return tail
+
+    def save(self, service_id, tail: LogTail) -> None:
+        data = {
+            # latin-1 maps every byte to one character, so the header survives the round trip as is
+            "header": tail.header.decode("latin-1") if tail.header is not None else None,
+            "offset": tail.offset,
+            "lines": tail.lines,
+            "crc": tail.crc,
+            "last": tail.last.decode("latin-1"),
+        }
+        path = self.path(service_id)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
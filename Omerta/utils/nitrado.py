@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import time
+
+import aiofiles
+import aiohttp
+
+API_URL = "https://api.nitrado.net"
+
+# ADM logfile location inside the gameserver's directory, by game
+LOG_PATHS = {
+    "dayzps": "dayzps/config/DayZServer_PS4_x64.ADM",
+    "dayzxb": "dayzxb/config/DayZServer_X1_x64.ADM",
+}
+
+
+# Bytes read from the response and written to disk at a time while downloading
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def stream_to_file(res: aiohttp.ClientResponse, dest: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> int:
+    """
+        Writes a response body to ``dest`` chunk by chunk, returns the number of bytes written.
+
+    The body goes to ``dest.part`` first and is only renamed to ``dest`` once
+    it's complete, so a reader never sees a partially downloaded file.
+    """
+    tmp = f"{dest}.part"
+    size = 0
+    try:
+        async with aiofiles.open(tmp, mode="wb") as f:
+            async for chunk in res.content.iter_chunked(chunk_size):
+                await f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, dest)
+    return size
+
+
+async def write_file(dest: str, data: bytes) -> None:
+    """Writes ``data`` to ``dest`` through ``dest.part``, same as ``stream_to_file``."""
+    tmp = f"{dest}.part"
+    try:
+        async with aiofiles.open(tmp, mode="wb") as f:
+            await f.write(data)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, dest)
+
+
+class NitradoError(Exception):
+    def __init__(self, status: int) -> None:
+        self.status = status
+        super().__init__(f"Nitrado API responded with status {status}")
+
+
+class NitradoClient:
+    """
+        Bot-wide HTTP client for the Nitrado API.
+
+    All cogs share one ``aiohttp.ClientSession`` so requests reuse pooled
+    keep-alive connections instead of doing a new TCP+TLS handshake every time.
+    Paths starting with ``/`` are sent to the Nitrado API with the bot's token,
+    anything else (download tokens, webhooks) is requested as is.
+    """
+
+    def __init__(self, token: str, *, limit: int = 100, limit_per_host: int = 10,
+                 dns_ttl: int = 300, keepalive: float = 30.0, gameserver_ttl: float = 60.0,
+                 log_paths_file: str = None) -> None:
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.gameserver_ttl = gameserver_ttl
+        self._session = None
+        self._gameservers = {}
+        self._pending = {}
+        self._generation = {}
+        self._settings_locks = {}
+        self.log_paths_file = log_paths_file
+        self._log_paths = {}
+        if log_paths_file is not None and os.path.exists(log_paths_file):
+            with open(log_paths_file) as f:
+                self._log_paths = json.load(f)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Created lazily, the session has to be made while the event loop is running
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def request(self, method: str, url: str, *, auth: bool = None, headers: dict = None, **kwargs):
+        if url.startswith("/"):
+            url = f"{API_URL}{url}"
+            auth = True if auth is None else auth
+        if auth:
+            headers = {**self.headers, **(headers or {})}
+        return self.session.request(method, url, headers=headers, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def gameserver(self, service_id, *, refresh: bool = False) -> dict:
+        """
+            Returns the ``gameserver`` object of ``GET /services/{id}/gameservers``.
+
+        Responses are cached for ``gameserver_ttl`` seconds and callers asking
+        while a request is already running wait for that one instead of sending
+        their own. Pass ``refresh=True`` to skip the cache, e.g. before writing
+        settings that were derived from it. Raises NitradoError on a non 200 response.
+        """
+        cached = self._gameservers.get(service_id)
+        if cached is not None and not refresh and cached[0] > time.monotonic():
+            return cached[1]
+
+        pending = self._pending.get(service_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_gameserver(service_id))
+            self._pending[service_id] = pending
+            pending.add_done_callback(lambda fut: self._pending.get(service_id) is fut and self._pending.pop(service_id))
+        return await asyncio.shield(pending)
+
+    async def _fetch_gameserver(self, service_id) -> dict:
+        generation = self._generation.get(service_id, 0)
+        async with self.get(f"/services/{service_id}/gameservers") as res:
+            if res.status != 200:
+                raise NitradoError(res.status)
+            json = await res.json()
+
+        gameserver = json["data"]["gameserver"]
+        if self._generation.get(service_id, 0) == generation:
+            # Not invalidated while the request was running
+            self._gameservers[service_id] = (time.monotonic() + self.gameserver_ttl, gameserver)
+        return gameserver
+
+    def cached_gameserver(self, service_id):
+        """The gameserver details fetched last, however old they are, or None. Never sends a request."""
+        cached = self._gameservers.get(service_id)
+        return cached[1] if cached is not None else None
+
+    def invalidate(self, service_id) -> None:
+        """Drops the cached gameserver details, call after changing the server's settings or state."""
+        self._gameservers.pop(service_id, None)
+        self._pending.pop(service_id, None)
+        self._generation[service_id] = self._generation.get(service_id, 0) + 1
+
+    def settings_lock(self, service_id) -> asyncio.Lock:
+        """Hold while reading, changing and writing back a service's settings, so concurrent changes don't overwrite each other."""
+        lock = self._settings_locks.get(service_id)
+        if lock is None:
+            lock = self._settings_locks[service_id] = asyncio.Lock()
+        return lock
+
+    async def log_path(self, service_id):
+        """
+            Returns the ``/games/{username}/noftp/...`` path of the service's ADM logfile.
+
+        The path is resolved from the gameserver details once and then kept (and
+        saved to ``log_paths_file``) until ``forget_log_path`` is called, which
+        the killfeeds do when downloading from it fails. Returns None for games
+        without a supported logfile, raises NitradoError if the lookup fails.
+        """
+        path = self._log_paths.get(str(service_id))
+        if path is None:
+            gameserver = await self.gameserver(service_id)
+            logpath = LOG_PATHS.get(gameserver["game"].lower())
+            if logpath is None:
+                return None
+
+            path = f"/games/{gameserver['username']}/noftp/{logpath}"
+            self._log_paths[str(service_id)] = path
+            self._save_log_paths()
+        return path
+
+    async def file_size(self, service_id, path: str) -> int:
+        """Size in bytes of a file on the gameserver, raises NitradoError on a non 200 response."""
+        async with self.get(f"/services/{service_id}/gameservers/file_server/size", params={"path": path}) as res:
+            if res.status != 200:
+                raise NitradoError(res.status)
+            json = await res.json()
+        return int(json["data"]["size"])
+
+    def forget_log_path(self, service_id) -> None:
+        if self._log_paths.pop(str(service_id), None) is not None:
+            self._save_log_paths()
+
+    def _save_log_paths(self) -> None:
+        if self.log_paths_file is None:
+            return
+        tmp = f"{self.log_paths_file}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._log_paths, f)
+        os.replace(tmp, self.log_paths_file)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
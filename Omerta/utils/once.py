@@ -0,0 +1,38 @@
+import asyncio
+
+
+class Once:
+    """
+        Wraps a coroutine function so it only runs for the first caller.
+
+    Callers that come while it runs wait for that same run, later ones return
+    its result right away. A run that raised is started again by the next
+    caller, and ``reset`` makes the next caller run it again as well.
+    """
+
+    def __init__(self, function) -> None:
+        self.function = function
+        self._future = None
+
+    async def __call__(self, *args):
+        if self._future is None:
+            self._future = asyncio.ensure_future(self.function(*args))
+        future = self._future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._future is future:
+                self._future = None
+            raise
+
+    def reset(self) -> None:
+        self._future = None
+
+
+def shared(bot, name: str, factory):
+    """``bot.<name>``, made with ``factory(bot)`` by whichever cog asks first."""
+    value = getattr(bot, name, None)
+    if value is None:
+        value = factory(bot)
+        setattr(bot, name, value)
+    return value
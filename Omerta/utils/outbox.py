@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+import discord
+from discord.http import Route
+
+# Discord's limits for a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARACTERS = 6000
+
+
+class Outbox:
+    """
+        Per-channel queue of embeds that are posted in the background.
+
+    ``send`` queues the embed, a worker per channel then packs whatever is
+    waiting into messages of up to ``MAX_EMBEDS`` embeds. A channel holds at
+    most ``maxsize`` waiting embeds, past that ``send`` waits for the worker,
+    so Discord's rate limits slow down whatever feeds the outbox. Messages go
+    through the bot's HTTP client, which waits out Discord's rate-limit
+    buckets from the response headers, so no fixed sleep is needed between them.
+    """
+
+    def __init__(self, bot, maxsize: int = 100) -> None:
+        self.bot = bot
+        self.maxsize = maxsize
+        self.logger = logging.getLogger(__name__)
+        self._queues = {}
+        self._workers = {}
+
+    async def send(self, channel, embed: discord.Embed) -> None:
+        if channel is None:
+            # Channel was deleted or the bot can't see it
+            return
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = asyncio.Queue(self.maxsize)
+            self._workers[channel.id] = asyncio.ensure_future(self._deliver(channel.id, queue))
+        await queue.put(embed)
+
+    def pending(self, channel_id: int = None) -> int:
+        """Number of embeds waiting to be posted, in one channel or all of them."""
+        if channel_id is not None:
+            queue = self._queues.get(channel_id)
+            return queue.qsize() if queue is not None else 0
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    async def _deliver(self, channel_id: int, queue: asyncio.Queue) -> None:
+        route = Route("POST", "/channels/{channel_id}/messages", channel_id=channel_id)
+        carry = None
+        while True:
+            embed = carry if carry is not None else await queue.get()
+            carry = None
+            batch = [embed]
+            size = len(embed)
+            while len(batch) < MAX_EMBEDS and not queue.empty():
+                embed = queue.get_nowait()
+                if size + len(embed) > MAX_EMBED_CHARACTERS:
+                    carry = embed
+                    break
+                batch.append(embed)
+                size += len(embed)
+
+            try:
+                await self.bot.http.request(route, json={"embeds": [embed.to_dict() for embed in batch]})
+            except discord.HTTPException as e:
+                self.logger.error(f"Failed to post {len(batch)} embed(s) to {channel_id}: {e.status} {e.text}")
+            except Exception as e:
+                self.logger.exception(f"Failed to post {len(batch)} embed(s) to {channel_id}: {e}")
+
+    def close(self) -> None:
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
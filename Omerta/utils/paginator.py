@@ -0,0 +1,85 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+FIRST = "⏮"
+PREVIOUS = "◀"
+NEXT = "▶"
+LAST = "⏭"
+
+
+class Paginator:
+    """
+        Shows a list as embed pages that are flipped through with reactions.
+
+    Only the page being shown is rendered, so the time it takes doesn't
+    depend on the length of the list. ``template`` formats each item,
+    ``header`` goes above the items of every page.
+    """
+
+    def __init__(self, title: str, items, *, header: str = "", template: str = "{}",
+                 per_page: int = 25, color: int = 0X000001, timeout: float = 120.0) -> None:
+        self.title = title
+        self.items = items
+        self.header = header
+        self.template = template
+        self.per_page = per_page
+        self.color = color
+        self.timeout = timeout
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self.items) // self.per_page))
+
+    def page(self, index: int, ctx: commands.Context) -> discord.Embed:
+        start = index * self.per_page
+        lines = [self.template.format(item) for item in self.items[start:start + self.per_page]]
+        embed = discord.Embed(title=self.title, color=self.color, timestamp=ctx.message.created_at,
+                              description="\n".join([self.header, *lines]) if self.header else "\n".join(lines))
+        embed.set_footer(icon_url=ctx.author.avatar_url, text=f"{ctx.author.name} | Page {index + 1}/{self.pages}")
+        return embed
+
+    async def start(self, ctx: commands.Context) -> discord.Message:
+        """Sends the first page, then follows the author's reactions until ``timeout`` seconds pass without one."""
+        message = await ctx.send(embed=self.page(0, ctx))
+        if self.pages == 1:
+            return message
+
+        for emoji in (FIRST, PREVIOUS, NEXT, LAST):
+            await message.add_reaction(emoji)
+
+        def check(reaction: discord.Reaction, user: discord.User) -> bool:
+            return reaction.message.id == message.id and user.id == ctx.author.id and str(reaction.emoji) in (FIRST, PREVIOUS, NEXT, LAST)
+
+        index = 0
+        while True:
+            try:
+                reaction, user = await ctx.bot.wait_for("reaction_add", check=check, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                break
+
+            emoji = str(reaction.emoji)
+            if emoji == FIRST:
+                page = 0
+            elif emoji == PREVIOUS:
+                page = max(0, index - 1)
+            elif emoji == NEXT:
+                page = min(self.pages - 1, index + 1)
+            else:
+                page = self.pages - 1
+
+            try:
+                await message.remove_reaction(reaction.emoji, user)
+            except discord.HTTPException:
+                # Missing the Manage Messages permission, the author has to remove it themselves
+                pass
+            if page != index:
+                index = page
+                await message.edit(embed=self.page(index, ctx))
+
+        try:
+            await message.clear_reactions()
+        except discord.HTTPException:
+            pass
+        return message
@@ -0,0 +1,89 @@
+import asyncio
+import inspect
+import logging
+
+
+class Stage:
+    """
+        One step of a Pipeline, ``workers`` tasks taking items from a bounded queue.
+
+    ``handler`` is either a coroutine function, whose result is passed on
+    unless it is None, or an async generator function, every value it yields
+    is passed on. Items leave a stage in order only when it has one worker.
+    """
+
+    def __init__(self, name: str, handler, *, workers: int = 1, maxsize: int = 100) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self.queue = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+
+class Pipeline:
+    """
+        Stages connected by bounded ``asyncio.Queue`` objects.
+
+    A stage waits when the next one's queue is full, so a slow stage (the
+    database, Discord) holds back the ones before it instead of letting work
+    pile up in memory. An item that makes a handler raise is logged and
+    dropped, the rest keep flowing.
+    """
+
+    def __init__(self, *stages: Stage) -> None:
+        self.stages = stages
+        self.logger = logging.getLogger(__name__)
+        self._tasks = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        for stage in self.stages:
+            # Made here, the queues belong to the loop the pipeline runs on
+            stage.queue = asyncio.Queue(stage.maxsize)
+        for index, stage in enumerate(self.stages):
+            following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for _ in range(stage.workers):
+                self._tasks.append(asyncio.ensure_future(self._work(stage, following)))
+
+    async def put(self, item) -> None:
+        """Feeds an item to the first stage, waits while its queue is full."""
+        self.start()
+        await self.stages[0].queue.put(item)
+
+    async def join(self) -> None:
+        """Waits until every item put so far has gone through all stages."""
+        for stage in self.stages:
+            if stage.queue is not None:
+                await stage.queue.join()
+
+    def depths(self) -> dict:
+        return {stage.name: stage.depth for stage in self.stages}
+
+    async def _work(self, stage: Stage, following: Stage) -> None:
+        generator = inspect.isasyncgenfunction(stage.handler)
+        while True:
+            item = await stage.queue.get()
+            try:
+                if generator:
+                    async for result in stage.handler(item):
+                        if following is not None:
+                            await following.queue.put(result)
+                else:
+                    result = await stage.handler(item)
+                    if result is not None and following is not None:
+                        await following.queue.put(result)
+            except Exception as e:
+                self.logger.exception(f"Pipeline stage {stage.name} failed: {type(e).__name__}: {e}")
+            finally:
+                # Only after the results were passed on, so join() can't return early
+                stage.queue.task_done()
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,112 @@
+import asyncio
+
+from utils.nitrado import NitradoClient, NitradoError
+
+
+async def read_names(message, text: str = None) -> list:
+    """The names given one per line in ``text`` and in the text files attached to ``message``."""
+    lines = text.splitlines() if text else []
+    for attachment in message.attachments:
+        data = await attachment.read()
+        lines.extend(data.decode("utf-8-sig", errors="replace").splitlines())
+    return [line.strip() for line in lines if line.strip()]
+
+
+class PlayerList:
+    """
+        The names of a Nitrado player list setting, e.g. the whitelist or the bans.
+
+    Names are matched case-insensitively (by ``str.casefold``) after
+    stripping surrounding whitespace, the same way the consoles treat
+    gamertags, so "Player" and "player" are one entry. Each name keeps the
+    spelling and position it was first added with. ``serialize`` gives back
+    the newline-joined value Nitrado stores.
+    """
+
+    def __init__(self, names=()) -> None:
+        self._names = {}
+        self.update(names)
+
+    @staticmethod
+    def key(name: str) -> str:
+        return name.strip().casefold()
+
+    @classmethod
+    def parse(cls, value: str) -> "PlayerList":
+        return cls(value.splitlines())
+
+    def serialize(self) -> str:
+        return "\n".join(self._names.values())
+
+    def copy(self) -> "PlayerList":
+        return PlayerList(self._names.values())
+
+    def add(self, name: str) -> bool:
+        """Adds ``name`` unless it's already listed, returns whether it was added."""
+        key = self.key(name)
+        if not key or key in self._names:
+            return False
+        self._names[key] = name.strip()
+        return True
+
+    def remove(self, name: str) -> bool:
+        return self._names.pop(self.key(name), None) is not None
+
+    def update(self, names) -> list:
+        """Adds several names, returns the ones that weren't listed yet."""
+        return [name.strip() for name in names if self.add(name)]
+
+    def difference_update(self, names) -> list:
+        """Removes several names, returns the ones that were listed."""
+        return [name.strip() for name in names if self.remove(name)]
+
+    def __contains__(self, name: str) -> bool:
+        return self.key(name) in self._names
+
+    def __iter__(self):
+        return iter(self._names.values())
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class PlayerListSetting:
+    """
+        Reads and writes one player list setting of a gameserver.
+
+    The parsed list is kept for as long as the raw value Nitrado returns
+    doesn't change. Changes to any number of names are written back with a
+    single settings request, hold ``lock`` from loading the list until it's
+    saved. Both methods raise NitradoError if a request fails.
+    """
+
+    def __init__(self, nitrado: NitradoClient, service_id, key: str) -> None:
+        self.nitrado = nitrado
+        self.service_id = service_id
+        self.key = key
+        self._value = None
+        self._players = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        # Shared by all settings of the service, they are written through the same endpoint
+        return self.nitrado.settings_lock(self.service_id)
+
+    async def load(self, *, refresh: bool = False) -> PlayerList:
+        gameserver = await self.nitrado.gameserver(self.service_id, refresh=refresh)
+        value = gameserver["settings"]["general"][self.key]
+        if value != self._value:
+            self._value = value
+            self._players = PlayerList.parse(value)
+        return self._players.copy()
+
+    async def save(self, players: PlayerList) -> None:
+        value = players.serialize()
+        # Sent as a form body, a list of thousands of names doesn't fit in a URL
+        data = {"category": "general", "key": self.key, "value": value}
+        async with self.nitrado.post(f"/services/{self.service_id}/gameservers/settings", data=data) as res:
+            self.nitrado.invalidate(self.service_id)
+            if res.status != 200:
+                raise NitradoError(res.status)
+        self._value = value
+        self._players = players.copy()
@@ -0,0 +1,76 @@
+from utils.once import Once, shared
+
+
+class OnlinePlayer:
+    __slots__ = ("player_id", "name", "x", "z")
+
+    def __init__(self, player_id: str, name: str, x: float = None, z: float = None) -> None:
+        self.player_id = player_id
+        self.name = name
+        self.x = x
+        self.z = z
+
+
+class Roster:
+    """
+        The players online on the server and their last position, kept in memory.
+
+    The killfeed keeps it current from the connect, disconnect and position
+    lines it reads, so commands can answer without asking the database.
+    ``load`` fills it from the player table once, when the bot starts.
+    """
+
+    def __init__(self) -> None:
+        self.players = {}
+        self.names = {}
+        self._loaded = Once(self._load)
+
+    async def load(self, pool, table: str) -> None:
+        """Reads the online players from the database the first time it's called, later calls return right away."""
+        await self._loaded(pool, table)
+
+    async def _load(self, pool, table: str) -> None:
+        async with pool.acquire() as conn:
+            query = f'SELECT player_id, player_name, last_pos_x, last_pos_z FROM "{table}" WHERE online = $1;'
+            rows = await conn.fetch(query, True)
+        for row in rows:
+            # Lines read while the query ran are newer than the database
+            if row["player_id"] not in self.players:
+                player = self.connect(row["player_id"], row["player_name"])
+                player.x = row["last_pos_x"]
+                player.z = row["last_pos_z"]
+
+    def connect(self, player_id: str, name: str) -> OnlinePlayer:
+        player = self.players.get(player_id)
+        if player is None:
+            player = self.players[player_id] = OnlinePlayer(player_id, name)
+        elif player.name != name:
+            self.names.pop(player.name, None)
+            player.name = name
+        self.names[name] = player_id
+        return player
+
+    def move(self, player_id: str, name: str, x: float, z: float) -> None:
+        # Only players that are online have a position in the log
+        player = self.connect(player_id, name)
+        player.x = float(x)
+        player.z = float(z)
+
+    def disconnect(self, player_id: str) -> None:
+        player = self.players.pop(player_id, None)
+        if player is not None and self.names.get(player.name) == player_id:
+            del self.names[player.name]
+
+    def get(self, name: str) -> OnlinePlayer:
+        player_id = self.names.get(name)
+        return self.players.get(player_id) if player_id is not None else None
+
+    def __iter__(self):
+        return iter(self.players.values())
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+
+def roster_of(bot) -> Roster:
+    return shared(bot, "roster", lambda bot: Roster())
@@ -0,0 +1,53 @@
+import random
+import time
+
+# Gameserver states in which nothing is written to the log
+STOPPED = frozenset(("stopped", "suspended", "guardian_locked"))
+
+
+class AdaptiveSchedule:
+    """
+        Per-server poll intervals that follow how busy each server is.
+
+    A server that wrote at least ``busy_lines`` lines since its last poll is
+    polled again after ``minimum`` seconds, one with players online after half
+    of ``base`` and one with some new lines after ``base``. Idle servers back
+    off, doubling their interval up to ``maximum``, which stopped servers get
+    right away. Every interval is moved by up to ``jitter`` (a fraction) in
+    either direction, so servers don't end up polling at the same moment.
+    """
+
+    def __init__(self, base: float, minimum: float, maximum: float, *,
+                 busy_lines: int = 500, jitter: float = 0.1) -> None:
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.busy_lines = busy_lines
+        self.jitter = jitter
+        self.intervals = {}
+        self.next_due = {}
+
+    def due(self, keys, now: float = None) -> list:
+        """The keys that should be polled now, servers that were never planned are due right away."""
+        now = time.monotonic() if now is None else now
+        return [key for key in keys if self.next_due.get(key, 0.0) <= now]
+
+    def plan(self, key, *, new_lines: int = 0, players: int = None, running: bool = True, now: float = None) -> float:
+        """Sets when ``key`` is due next from the outcome of the poll that just finished, returns the delay."""
+        previous = self.intervals.get(key, self.base)
+        if not running:
+            interval = self.maximum
+        elif new_lines >= self.busy_lines:
+            interval = self.minimum
+        elif players:
+            interval = max(self.minimum, self.base / 2)
+        elif new_lines > 0:
+            interval = self.base
+        else:
+            interval = min(max(previous, self.base) * 2, self.maximum)
+        self.intervals[key] = interval
+
+        delay = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        now = time.monotonic() if now is None else now
+        self.next_due[key] = now + delay
+        return delay
@@ -0,0 +1,51 @@
+from collections import deque
+from hashlib import blake2b
+
+# ~2MB of hashes, more than a busy server writes in a single session
+MAX_SEEN_LINES = 250000
+
+
+class SeenLines:
+    """
+        Bounded set of log lines that were already processed.
+
+    Lines are stored as 64-bit hashes of their stripped text, so membership
+    checks are O(1) and memory doesn't depend on line length. Once ``maxlen``
+    hashes are stored the oldest ones are dropped first.
+    """
+
+    __slots__ = ("maxlen", "_keys", "_order")
+
+    def __init__(self, maxlen: int = MAX_SEEN_LINES) -> None:
+        self.maxlen = maxlen
+        self._keys = set()
+        self._order = deque()
+
+    @staticmethod
+    def key(line) -> int:
+        if isinstance(line, str):
+            line = line.encode("utf-8", errors="replace")
+        return int.from_bytes(blake2b(line.strip(), digest_size=8).digest(), "little")
+
+    def __contains__(self, line) -> bool:
+        return self.key(line) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, line) -> bool:
+        """Adds a line, returns False if it had been seen before."""
+        return self.add_key(self.key(line))
+
+    def add_key(self, key: int) -> bool:
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._order.append(key)
+        if len(self._order) > self.maxlen:
+            self._keys.discard(self._order.popleft())
+        return True
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._order.clear()
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+
+from utils.once import Once, shared
+
+# Postgres channel that is notified whenever the service row changes
+CHANNEL = "service_settings"
+
+# Columns that are switched on and off with ``toggle``
+FLAGS = frozenset(("con_logs", "build_feed", "keepstarted", "auto_lb", "location"))
+
+
+def channel_id(value):
+    return int(value) if value is not None else None
+
+
+class ServiceSettings:
+    """
+        The ``service`` row held in memory.
+
+    Loaded once and then read without a query, so pollers can check their
+    flags as often as they like. Flags are flipped in the database with a
+    single ``UPDATE ... RETURNING``, which also refreshes the object, and a
+    ``NOTIFY`` on ``CHANNEL`` makes every bot listening reload the row.
+    The listening connection is shared by every cog that called ``use`` and
+    only given back once the last of them called ``release``.
+    """
+
+    def __init__(self, pool) -> None:
+        self.pool = pool
+        self.logger = logging.getLogger(__name__)
+        self.row = {}
+        self.con_logs = False
+        self.con_logs_channel = None
+        self.build_feed = False
+        self.build_feed_channel = None
+        self.pvp_feed_channel = None
+        self.pve_feed_channel = None
+        self.keepstarted = False
+        self.auto_lb = False
+        self.webhook_url = None
+        self.location = False
+        self._loaded = Once(self._load)
+        self._listener = None
+        self.users = 0
+
+    def apply(self, row) -> None:
+        self.row = dict(row)
+        self.con_logs = self.row.get("con_logs") is True
+        self.con_logs_channel = channel_id(self.row.get("con_logs_channel"))
+        self.build_feed = self.row.get("build_feed") is True
+        self.build_feed_channel = channel_id(self.row.get("build_feed_channel"))
+        self.pvp_feed_channel = channel_id(self.row.get("pvp_feed_channel"))
+        self.pve_feed_channel = channel_id(self.row.get("pve_feed_channel"))
+        self.keepstarted = self.row.get("keepstarted") is True
+        self.auto_lb = self.row.get("auto_lb") is True
+        self.webhook_url = self.row.get("webhook_url")
+        self.location = self.row.get("location") is True
+
+    async def load(self) -> "ServiceSettings":
+        """Reads the row and starts listening for changes the first time it's called, later calls return right away."""
+        await self._loaded()
+        return self
+
+    async def _load(self) -> None:
+        await self.reload()
+        if self._listener is None:
+            # Held until close(), a pooled connection would stop listening when released
+            self._listener = await self.pool.acquire()
+            await self._listener.add_listener(CHANNEL, self.notified)
+
+    async def reload(self) -> None:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow("SELECT * FROM service;")
+        self.apply(row)
+
+    def notified(self, connection, pid: int, channel: str, payload: str) -> None:
+        reload = asyncio.ensure_future(self.reload())
+        reload.add_done_callback(self.reloaded)
+
+    def reloaded(self, reload) -> None:
+        if not reload.cancelled() and reload.exception() is not None:
+            self.logger.error(f"Failed to reload the service settings: {reload.exception()}")
+
+    async def toggle(self, flag: str) -> bool:
+        """Flips ``flag`` in the database and returns its new value."""
+        if flag not in FLAGS:
+            raise ValueError(f"{flag} can't be toggled")
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # A flag that was never set (NULL) counts as off
+                row = await conn.fetchrow(f"UPDATE service SET {flag} = NOT COALESCE({flag}, false) RETURNING *;")
+                # Delivered once the transaction commits
+                await conn.execute("SELECT pg_notify($1, $2);", CHANNEL, flag)
+        self.apply(row)
+        return getattr(self, flag)
+
+    def use(self) -> "ServiceSettings":
+        """Call when a cog is loaded, pair with ``release`` in its ``cog_unload``."""
+        self.users += 1
+        return self
+
+    async def release(self) -> None:
+        self.users -= 1
+        if self.users <= 0:
+            # The other cogs would stop getting updates if it was closed any earlier
+            self.users = 0
+            await self.close()
+
+    async def close(self) -> None:
+        """Gives the listening connection back to the pool, the next ``load`` reads the row and listens again."""
+        self._loaded.reset()
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            await listener.remove_listener(CHANNEL, self.notified)
+            await self.pool.release(listener)
+
+
+def settings_of(bot) -> ServiceSettings:
+    return shared(bot, "settings", lambda bot: ServiceSettings(bot.db))
@@ -0,0 +1,122 @@
+class PlayerDelta:
+    """Changes to one player's stat columns, applied on top of the stored values."""
+
+    __slots__ = ("kills", "pvp_deaths", "pve_deaths", "playtime",
+                 "reset_killstreak", "killstreak", "reset_deathstreak", "deathstreak",
+                 "longest_kill_distance", "longest_kill_weapon")
+
+    def __init__(self) -> None:
+        self.kills = 0
+        self.pvp_deaths = 0
+        self.pve_deaths = 0
+        self.playtime = 0
+        # Streaks are stored as "reset to 0 first, then add", which is what any
+        # sequence of increments and resets collapses to
+        self.reset_killstreak = False
+        self.killstreak = 0
+        self.reset_deathstreak = False
+        self.deathstreak = 0
+        self.longest_kill_distance = None
+        self.longest_kill_weapon = None
+
+
+class StatBatch:
+    """
+        Player table writes collected while reading one poll's log lines.
+
+    The killfeed records what happened per line and ``flush`` writes all of
+    it in a single transaction with one ``executemany`` per kind of update,
+    so a poll costs one connection from the pool instead of one per line.
+    Later changes to the same player overwrite (names, status, positions) or
+    add up with (stats) earlier ones, in log order.
+    """
+
+    def __init__(self) -> None:
+        self.players = {}
+        self.positions = {}
+        self.logins = {}
+        self.stats = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.players or self.positions or self.logins or self.stats)
+
+    def _delta(self, player_id: str) -> PlayerDelta:
+        delta = self.stats.get(player_id)
+        if delta is None:
+            delta = self.stats[player_id] = PlayerDelta()
+        return delta
+
+    def seen(self, player_id: str, player_name: str, online: bool = True) -> None:
+        """Makes sure the player has a row, with their current name and online status."""
+        self.players[player_id] = (player_name, online)
+
+    def move(self, player_id: str, x: float, z: float) -> None:
+        self.positions[player_id] = (float(x), float(z))
+
+    def login(self, player_id: str, login_time: str) -> None:
+        self.logins[player_id] = login_time
+
+    def playtime(self, player_id: str, seconds: int) -> None:
+        self._delta(player_id).playtime += seconds
+
+    def pve_death(self, player_id: str) -> None:
+        self._delta(player_id).pve_deaths += 1
+
+    def kill(self, killer_id: str, victim_id: str, distance: float, weapon: str) -> None:
+        killer = self._delta(killer_id)
+        killer.kills += 1
+        killer.killstreak += 1
+        killer.reset_deathstreak = True
+        killer.deathstreak = 0
+        if killer.longest_kill_distance is None or distance >= killer.longest_kill_distance:
+            killer.longest_kill_distance = float(distance)
+            killer.longest_kill_weapon = weapon
+
+        # Dying ends the victim's kill streak, the killer's keeps going
+        victim = self._delta(victim_id)
+        victim.pvp_deaths += 1
+        victim.deathstreak += 1
+        victim.reset_killstreak = True
+        victim.killstreak = 0
+
+    async def flush(self, conn, table: str) -> None:
+        """Writes everything collected so far through ``conn`` and empties the batch."""
+        if not self:
+            return
+
+        async with conn.transaction():
+            if self.players:
+                query = f'''INSERT INTO "{table}" (player_id, player_name, online) VALUES ($1, $2, $3)
+                            ON CONFLICT (player_id) DO UPDATE SET (player_name, online) = ($2, $3);'''
+                await conn.executemany(query, [(player_id, name, online) for player_id, (name, online) in self.players.items()])
+
+            if self.positions:
+                query = f'UPDATE "{table}" SET (last_pos_x, last_pos_z) = ($2, $3) WHERE player_id = $1;'
+                await conn.executemany(query, [(player_id, x, z) for player_id, (x, z) in self.positions.items()])
+
+            if self.logins:
+                query = f'UPDATE "{table}" SET last_login = $2 WHERE player_id = $1;'
+                await conn.executemany(query, list(self.logins.items()))
+
+            if self.stats:
+                query = f'''UPDATE "{table}" SET
+                                kills = kills + $2,
+                                pvp_deaths = pvp_deaths + $3,
+                                pve_deaths = pve_deaths + $4,
+                                playtime = playtime + $5,
+                                killstreak = CASE WHEN $6::bool THEN 0 ELSE killstreak END + $7,
+                                deathstreak = CASE WHEN $8::bool THEN 0 ELSE deathstreak END + $9,
+                                longest_kill_weapon = CASE WHEN longest_kill_distance <= $10::float8 THEN $11 ELSE longest_kill_weapon END,
+                                longest_kill_distance = CASE WHEN longest_kill_distance <= $10::float8 THEN $10::float8 ELSE longest_kill_distance END
+                            WHERE player_id = $1;'''
+                await conn.executemany(query, [
+                    (player_id, d.kills, d.pvp_deaths, d.pve_deaths, d.playtime,
+                     d.reset_killstreak, d.killstreak, d.reset_deathstreak, d.deathstreak,
+                     d.longest_kill_distance, d.longest_kill_weapon)
+                    for player_id, d in self.stats.items()
+                ])
+
+        self.players.clear()
+        self.positions.clear()
+        self.logins.clear()
+        self.stats.clear()
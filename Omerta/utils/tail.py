@@ -0,0 +1,90 @@
+import re
+import zlib
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+# Bytes before ``offset`` that a ranged download asks for again, to check it continues the same log
+OVERLAP = 256
+
+
+class LogTail:
+    """
+        Remembers how far into a service's ADM log the killfeed has read.
+
+    ``offset`` is the byte position of the first unprocessed line in the remote
+    file and ``header`` is the ``AdminLog started on`` line of the session it
+    belongs to. ``start`` is where that position lies in the local copy: the
+    length of ``last`` after a ranged download (the copy holds those bytes
+    again, followed by the new suffix) and ``offset`` after a full one.
+    ``lines`` counts the lines before ``offset`` and ``crc`` is a rolling
+    CRC-32 of their bytes, ``last`` are the final ``OVERLAP`` bytes of them.
+    A download still continues what was read if the bytes just before
+    ``start`` are ``last``, the CRC is only needed for checkpoints saved
+    without them.
+    """
+
+    __slots__ = ("offset", "header", "start", "lines", "crc", "last")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.offset = 0
+        self.header = None
+        self.start = 0
+        self.lines = 0
+        self.crc = 0
+        self.last = b""
+
+    def range_headers(self) -> dict:
+        if self.offset == 0 or not self.last:
+            # Without the bytes to compare with, only a full download can be checked
+            return {}
+        return {"Range": f"bytes={self.offset - len(self.last)}-"}
+
+    def accept(self, status: int, content_range: str = None) -> bool:
+        """
+            Updates ``start`` from the download response.
+
+        Returns False when the response doesn't line up with ``offset`` (the
+        log was rotated or the range was ignored in an unexpected way), in
+        which case the tail is reset and the caller should download again.
+        A ranged download still has to be checked with ``matches``.
+        """
+        if status == 206:
+            match = _CONTENT_RANGE.match(content_range or "")
+            if match is None or int(match.group(1)) != self.offset - len(self.last):
+                self.reset()
+                return False
+            self.start = len(self.last)
+        else:
+            self.start = self.offset
+        return True
+
+    def advance(self, raw: bytes, lines: int = 1) -> None:
+        """Moves past ``raw``, which holds ``lines`` complete lines."""
+        self.offset += len(raw)
+        self.start += len(raw)
+        self.lines += lines
+        self.crc = zlib.crc32(raw, self.crc)
+        if len(raw) >= OVERLAP:
+            self.last = bytes(raw[-OVERLAP:])
+        else:
+            self.last = (self.last + bytes(raw))[-OVERLAP:]
+
+    def overlap(self) -> int:
+        """Where the bytes ``matches`` checks begin in the local copy, they end at ``start``."""
+        return self.start - len(self.last) if self.last else 0
+
+    def matches(self, prefix) -> bool:
+        """Whether ``prefix`` (the local copy from ``overlap()`` to ``start``) is what was read last."""
+        if self.last:
+            return bytes(prefix) == self.last
+        # Nothing to compare a window with, the whole prefix has to add up to the CRC
+        return len(prefix) == self.offset and zlib.crc32(prefix) == self.crc
+
+
+def remote_size(content_range: str) -> int:
+    """Total size from a ``Content-Range`` header, or -1 when it is unknown."""
+    match = re.search(r"/(\d+)$", content_range or "")
+    return int(match.group(1)) if match else -1
@@ -0,0 +1,111 @@
+from math import floor, sqrt
+
+try:
+    import numpy
+except ImportError:
+    # Listed in requirements.txt, without it near_many() falls back to looking up every position on its own
+    numpy = None
+
+# Side length of a grid cell in meters, about the size of a typical zone
+CELL_SIZE = 500.0
+# Positions measured against all zones at once, bounds the size of the distance matrix
+BATCH_SIZE = 4096
+
+
+class Zone:
+    """A zone alarm row, with its ``no_alert`` list turned into a set."""
+
+    __slots__ = ("id", "name", "x", "z", "radius", "channel", "no_alert", "order")
+
+    def __init__(self, record, order: int = 0) -> None:
+        self.id = record["id"]
+        self.name = record["name"]
+        self.x = float(record["x_coord"])
+        self.z = float(record["z_coord"])
+        self.radius = float(record["radius"])
+        self.channel = int(record["channel"])
+        self.order = order
+
+        no_alert = record["no_alert"]
+        if no_alert is None:
+            self.no_alert = frozenset()
+        elif isinstance(no_alert, str):
+            # Stored as text, keeps the substring match the check always did
+            self.no_alert = no_alert
+        else:
+            self.no_alert = frozenset(no_alert)
+
+    def alerts(self, player_name: str) -> bool:
+        return player_name not in self.no_alert
+
+
+class ZoneIndex:
+    """
+        Zones bucketed into a uniform grid on x/z.
+
+    Each zone is stored in every cell its radius overlaps, so looking up a
+    position only checks the zones of one cell instead of all of them.
+    """
+
+    def __init__(self, zones=(), cell_size: float = CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self.zones = []
+        self.cells = {}
+        self._arrays = None
+        for order, record in enumerate(zones):
+            self.add(Zone(record, order))
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def _cell(self, value: float) -> int:
+        return floor(value / self.cell_size)
+
+    def add(self, zone: Zone) -> None:
+        self.zones.append(zone)
+        self._arrays = None
+        for cx in range(self._cell(zone.x - zone.radius), self._cell(zone.x + zone.radius) + 1):
+            for cz in range(self._cell(zone.z - zone.radius), self._cell(zone.z + zone.radius) + 1):
+                self.cells.setdefault((cx, cz), []).append(zone)
+
+    def near(self, x: float, z: float) -> list:
+        """Returns ``(zone, distance)`` for every zone the position is inside of, in the zones' original order."""
+        hits = []
+        for zone in self.cells.get((self._cell(x), self._cell(z)), ()):
+            a = zone.x - x
+            b = zone.z - z
+            distance = round(sqrt(a * a + b * b), 2)
+            if distance < zone.radius:
+                hits.append((zone, distance))
+        hits.sort(key=lambda hit: hit[0].order)
+        return hits
+
+    def near_many(self, points: list) -> list:
+        """
+            Returns ``(index, zone, distance)`` for every zone each of the ``(x, z)`` points is inside of.
+
+        Hits are ordered by point and then by zone, like calling ``near`` for
+        each point in turn. With numpy installed the distances of a whole
+        block of points to all zones are computed in one go.
+        """
+        if numpy is None or not self.zones or not points:
+            return [(index, zone, distance) for index, (x, z) in enumerate(points) for zone, distance in self.near(x, z)]
+
+        if self._arrays is None:
+            self._arrays = (
+                numpy.array([zone.x for zone in self.zones]),
+                numpy.array([zone.z for zone in self.zones]),
+                numpy.array([zone.radius for zone in self.zones]),
+            )
+        zx, zz, radius = self._arrays
+
+        hits = []
+        for start in range(0, len(points), BATCH_SIZE):
+            block = numpy.asarray(points[start:start + BATCH_SIZE], dtype=float)
+            a = zx[None, :] - block[:, 0:1]
+            b = zz[None, :] - block[:, 1:2]
+            distances = numpy.round(numpy.sqrt(a * a + b * b), 2)
+            rows, cols = numpy.nonzero(distances < radius)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                hits.append((start + row, self.zones[col], float(distances[row, col])))
+        return hits